@@ -24,26 +24,212 @@ from FreeCAD import Base
 from FreeCAD import Part
 import Part
 from pivy import coin
+import bisect
+import functools
 import os
 import math
 import MeshPart
 import platform
+import re
 import subprocess
+from pathlib import Path
 
 from helpDefs import *
 
+# comments in pov code (see delComments()), the line break after a line comment is kept
+commentPattern = re.compile(r"/\*.*?\*/|//[^\n]*(?=\n)", re.DOTALL)
+
+# factor to convert color bytes to 0..1 (see uintColorToRGB())
+inverse255 = 1.0 / 255.0
+
+# material colors of FreeCAD that don't need a finish (see getFinish())
+defaultAmbientColor = (0.20000000298023224, 0.20000000298023224, 0.20000000298023224, 0)
+noColor = (0, 0, 0, 0)
+
+# declared names in pov code (see getDeclarations())
+declarationPattern = re.compile(r"#declare (\S+)")
+
+# camera statement in pov code
+cameraPattern = re.compile(r"\bcamera\s*\{")
+
 
 class ExportToPovRay:
     """Export a FreeCAD model to POV-Ray"""
 
+    writeBufferSize = 1 << 20  # buffer size for writing the pov and mesh file
+
+    # objects that aren't exported as mesh (for the statistics)
+    supportedTypeIds = frozenset((
+        "Part::Sphere",
+        "Part::Box",
+        "Part::Torus",
+        "Part::Cylinder",
+        "Part::Cone",
+        "Part::Ellipsoid",
+        "Part::Plane",
+        "Part::Cut",
+        "Part::MultiFuse",
+        "Part::Fuse",
+        "Part::MultiCommon",
+        "Part::Common",
+        "Part::Extrusion",
+        "PartDesign::Body",
+        "PartDesign::Pad",
+        "PartDesign::Pocket",
+        "Sketcher::SketchObject",
+        "App::DocumentObjectGroup",
+        "App::Part",
+        "Part::Compound",
+        "Image::ImagePlane",
+    ))
+    supportedNames = ("Array", "Clone", "PointLight", "AreaLight", "SpotLight")
+
+    # objects a body may contain to be exported without mesh (see isBodySupported())
+    bodySupportedTypeIds = frozenset((
+        "App::Origin",
+        "App::Line",
+        "App::Plane",
+        "Sketcher::SketchObject",
+        "PartDesign::Pad",
+        "PartDesign::Pocket",
+        "PartDesign::Point",
+        "PartDesign::Line",
+        "PartDesign::Plane",
+    ))
+
+    # fixed pov code of the lights, filled in createPointLight(), createAreaLight() and createSpotLight()
+    pointLightTemplate = (
+        "\nlight_source {{ <0, 0, 0>"
+        "\n\tcolor rgb<{red}, {green}, {blue}>"
+    )
+
+    areaLightTemplate = (
+        "\nlight_source {{ <0, 0, 0>"
+        "\n\tcolor rgb<{red}, {green}, {blue}>"
+        "\n\tarea_light"
+        "\n\t<{length}, 0, 0>, <0, {width}, 0>"
+        "\n\t{lengthLights}, {widthLights}"
+        "\n\tadaptive {adaptive}"
+    )
+
+    spotLightTemplate = (
+        "\nlight_source {{ <0, 0, 0>"
+        "\n\tcolor rgb<{red}, {green}, {blue}>"
+        "\n\tspotlight"
+        "\n\tpoint_at <0, -1, 0>"
+        "\n\tradius {radius}"
+        "\n\tfalloff {falloff}"
+        "\n\ttightness {tightness}"
+    )
+
+    fadeTemplate = "\n\tfade_distance {fadeDistance}\n\tfade_power {fadePower}"
+
+    # pov code of the array elements, filled in createArray()
+    polarArrayTemplate = (
+        "\n#declare i = 0;\n"
+        "#declare endNo = {number};\n"
+        "#declare axis = {axis};\n"
+        "#declare arrAngle = {angle};\n"
+        "#while (i < endNo)\n"
+        "\tobject {{ {declareName}\n"
+        "{centerTranslation}"
+        "\t\t#declare rotAngle = i * arrAngle / endNo;\n"
+        "\t\t#local vX = vaxis_rotate(x, axis, rotAngle);\n"
+        "\t\t#local vY = vaxis_rotate(y, axis, rotAngle);\n"
+        "\t\t#local vZ = vaxis_rotate(z, axis, rotAngle);\n"
+        "\t\ttransform {{\n"
+        "\t\t\tmatrix <vX.x, vX.y, vX.z, vY.x, vY.y, vY.z, vZ.x, vZ.y, vZ.z, 0, 0, 0>\n"
+        "\t\t}}\n"
+        "{centerBackTranslation}"
+        "{rotation}"
+        "{intervalTranslation}"
+        "{translation}"
+        "{pigment}"
+        "{photons}"
+        "    }}\n"
+        "\t#declare i = i + 1;\n"
+        "#end\n"
+    )
+
+    orthoArrayTemplate = (
+        "#declare intervalX = {intervalX};\n"
+        "#declare intervalY = {intervalY};\n"
+        "#declare intervalZ = {intervalZ};\n"
+        "\n"
+        "#declare numX = {numX};\n"
+        "#declare ix = 0;\n"
+        "#while (ix < numX)\n"
+        "\t#declare numY = {numY};\n"
+        "\t#declare iy = 0;\n"
+        "\t#while (iy < numY)\n"
+        "\t\t#declare numZ = {numZ};\n"
+        "\t\t#declare iz = 0;\n"
+        "\t\t#while (iz < numZ)\n"
+        "\t\t\tobject {{ {declareName}\n"
+        "\t\t\t\ttranslate intervalX * ix\n"
+        "\t\t\t\ttranslate intervalY * iy\n"
+        "\t\t\t\ttranslate intervalZ * iz\n"
+        "{translation}"
+        "{rotation}"
+        "{pigment}"
+        "{photons}"
+        "\t\t\t}}\n"
+        "\t\t\t#declare iz = iz + 1;\n"
+        "\t\t#end\n"
+        "\t\t#declare iy = iy + 1;\n"
+        "\t#end\n"
+        "\t#declare ix = ix + 1;\n"
+        "#end\n"
+    )
+
     def __init__(self):
         # get default shape color (editable in FreeCAD settings) (default rgb(0.8, 0.8, 0.8))
-        self.DefaultShapeColor = App.ParamGet(
-            "User parameter:BaseApp/Preferences/View"
-        ).GetUnsigned("DefaultShapeColor")
+        self.viewParams = App.ParamGet("User parameter:BaseApp/Preferences/View")
+        self.DefaultShapeColor = self.viewParams.GetUnsigned("DefaultShapeColor")
+        # default shape color in pov syntax (see getPigment())
+        self.DefaultShapeColorRGB = self.uintColorToRGB(self.DefaultShapeColor)
 
         self.os = platform.system()  # get system information
 
+        # line breaks of the written files, translated while writing
+        self.newline = "\r\n" if self.os == "Windows" else "\n"
+
+        # functions creating the pov code of the supported objects (see createPovCode())
+        self.createFunctions = {
+            "Part::Box": self.createBox,
+            "Part::Sphere": self.createSphere,
+            "Part::Ellipsoid": self.createEllipsoid,
+            "Part::Cone": self.createCone,
+            "Part::Cylinder": self.createCylinder,
+            "Part::Torus": self.createTorus,
+            "Part::Plane": self.createPlane,
+            "Part::Cut": self.createCut,
+            "Part::MultiFuse": self.createFusion,
+            "Part::Fuse": self.createFusion,
+            "Part::Compound": self.createFusion,
+            "Part::MultiCommon": self.createCommon,
+            "Part::Common": self.createCommon,
+            "Part::Extrusion": self.createExtrusion,
+            "Image::ImagePlane": self.createImagePlane,
+            "App::Part": self.createPart,
+            "PartDesign::Body": self.createBody,
+            "PartDesign::Pad": self.createPadPocket,
+            "PartDesign::Pocket": self.createPadPocket,
+        }
+
+        # Part::FeaturePython objects are recognized by the beginning of their name
+        self.createFunctionsByName = (
+            ("Array", self.createArray),  # Array from Draft workbench
+            ("Clone", self.createClone),  # Clone from Draft workbench
+            ("PointLight", self.createPointLight),
+            ("AreaLight", self.createAreaLight),
+            ("SpotLight", self.createSpotLight),
+        )
+
+        self.meshFile = None  # opened by createMesh() when the first mesh is written
+
+        self.clearCaches()
+
     def initExport(self, renderSettings):
         """Export the current FreeCAD model with the settings given by the Settings object (defined in helpDefs.py)."""
 
@@ -70,7 +256,12 @@ class ExportToPovRay:
         self.texIncName = renderSettings.texIncName
         self.texIncPath = renderSettings.texIncPath
 
-        self.meshFileContent = ""
+        # close the mesh file of an export that failed before it was closed
+        if self.meshFile is not None:
+            self.meshFile.close()
+        self.meshFile = None  # opened by createMesh() when the first mesh is written
+
+        self.clearCaches()  # results of the last export are outdated
 
         # get all output options
         self.width = renderSettings.width
@@ -95,11 +286,12 @@ class ExportToPovRay:
         self.hdriTransZ = renderSettings.hdriDict["transZ"]
 
         # get camera
-        self.CamOri = Gui.ActiveDocument.ActiveView.getCameraOrientation()
-        self.CamType = Gui.ActiveDocument.ActiveView.getCameraType()
-        self.CamPos = Gui.ActiveDocument.ActiveView.viewPosition()
-        self.CamNode = Gui.ActiveDocument.ActiveView.getCameraNode()
-        self.EulerCam = Gui.ActiveDocument.ActiveView.getCameraOrientation().toEuler()
+        activeView = Gui.ActiveDocument.ActiveView
+        self.CamOri = activeView.getCameraOrientation()
+        self.CamType = activeView.getCameraType()
+        self.CamPos = activeView.viewPosition()
+        self.CamNode = activeView.getCameraNode()
+        self.EulerCam = self.CamOri.toEuler()
 
         if (
             self.povPath != -1 and self.povPath != "" and self.povPath != " "
@@ -111,37 +303,29 @@ class ExportToPovRay:
                 App.Console.PrintError("Can't open the pov file\n\n")
                 return -1
 
-            # create inc file if necessary
-            file = open(self.incPath, "a+")
-            file.close()
+            # create inc file if necessary and read it
+            incFile = Path(self.incPath)
+            incFile.touch()
+            self.incContent = self.delComments(incFile.read_text())
 
-            # open inc file
-            file = open(self.incPath, "r")
-            self.incContent = file.read()
-            file.close()
+            # read texture inc file
+            self.texIncContent = Path(self.texIncPath).read_text()
 
-            self.incContent = self.delComments(self.incContent)
+            # names declared in the inc files (see isDeclared())
+            self.incDeclarations = self.getDeclarations(self.incContent)
+            self.texIncDeclarations = self.getDeclarations(self.texIncContent)
 
-            # open texture inc file
-            file = open(self.texIncPath, "r")
-            self.texIncContent = file.read()
-            file.close()
+            # a camera in the user inc file replaces the FreeCAD camera
+            self.hasIncCamera = cameraPattern.search(self.incContent) is not None
         else:
             App.Console.PrintMessage("\n\nCanceled\n\n")
             return -1
 
-        # get statistics
-        objs = App.ActiveDocument.Objects
-        self.statistics = self.getStatistics(objs)
+        # get the parents of all objects and the statistics
+        self.scanObjects(self.objs)
+        self.statistics = self.getStatistics()
         App.Console.PrintMessage(self.statistics)
 
-        # clear old mesh file
-        try:
-            file = open(self.meshPath, "w")
-            file.close()
-        except:
-            pass
-
         self.startExport()  # start the export
 
     def startExport(self):
@@ -158,86 +342,78 @@ class ExportToPovRay:
             self.exportFcView()
 
         # get the first layer and check visibility of parent objects
+        partChildren = self.partChildren
         for obj in self.objs:
-            guiObject = obj.ViewObject
-            if (
-                guiObject.Visibility
-                and obj.TypeId != "App::DocumentObjectGroup"
-                and not self.hasBodyAsParent(obj)
-                and not self.hasPartAsParent(obj)
-            ):
-                firstLayer.append(obj)
+            if not obj.ViewObject.Visibility:
+                continue
+            if obj.TypeId == "App::DocumentObjectGroup":
+                continue
+            if obj.Name in partChildren:  # has a body or part as parent
+                continue
+            firstLayer.append(obj)
 
         # create pov code of objects
-        objPovCode = ""
-        for obj in firstLayer:
-            objPovCode += self.createPovCode(obj, True, True, True, True, True, True)
+        objPovCode = []
+        try:
+            for obj in firstLayer:
+                objPovCode.append(self.createPovCode(obj, True, True, True, True, True, True))
+        finally:
+            # all meshes are written (or the export failed)
+            if self.meshFile is not None:
+                self.meshFile.close()
 
         # add general pov code / "header"
-        finalPovCode = "#version 3.7; // 3.6\nglobal_settings { assumed_gamma 1.0 }\n#default { finish { ambient 0.2 diffuse 0.9 } }\n"
-
-        finalPovCode += (
-            "#default { pigment { rgb "
-            + self.uintColorToRGB(self.DefaultShapeColor)
-            + " } }\n"
-        )
-
-        finalPovCode += "\n//------------------------------------------\n"
-        finalPovCode += '#include "colors.inc"\n#include "textures.inc"\n'
+        finalPovCode = [  # fragments of the final code
+            "#version 3.7; // 3.6\nglobal_settings { assumed_gamma 1.0 }\n#default { finish { ambient 0.2 diffuse 0.9 } }\n",
+            "#default { pigment { rgb " + self.DefaultShapeColorRGB + " } }\n",
+            "\n//------------------------------------------\n",
+            '#include "colors.inc"\n#include "textures.inc"\n',
+        ]
 
         if self.radiosity["radiosityName"] != -1:
-            finalPovCode += '\n#include "rad_def.inc"'
-            finalPovCode += "\nglobal_settings {\n"
-            finalPovCode += "\tradiosity {\n"
-            finalPovCode += "\t\tRad_Settings(" + self.radiosity["radiosityName"] + ", off, off)\n"
-            finalPovCode += "\t}\n"
-            finalPovCode += "}\n"
+            finalPovCode.append('\n#include "rad_def.inc"')
+            finalPovCode.append("\nglobal_settings {\n")
+            finalPovCode.append("\tradiosity {\n")
+            finalPovCode.append("\t\tRad_Settings(" + self.radiosity["radiosityName"] + ", off, off)\n")
+            finalPovCode.append("\t}\n")
+            finalPovCode.append("}\n")
 
             if self.radiosity["ambientTo0"]:
-                finalPovCode += "#default { finish{ ambient 0 } }\n"
+                finalPovCode.append("#default { finish{ ambient 0 } }\n")
 
-        finalPovCode += "\n//------------------------------------------\n"
+        finalPovCode.append("\n//------------------------------------------\n")
 
         # add textures inc include
-        finalPovCode += '#include "' + self.texIncName + '"\n'
+        finalPovCode.append('#include "' + self.texIncName + '"\n')
 
         # if model contains mesh objects, a mesh file will be included
-        if self.meshFileContent != "":
-            finalPovCode += '#include "' + self.meshName + '"\n'
+        # (the mesh file is closed, but still set if meshes were written)
+        if self.meshFile is not None:
+            finalPovCode.append('#include "' + self.meshName + '"\n')
 
-        finalPovCode += "\n//------------------------------------------\n"
-        finalPovCode += "// Camera ----------------------------------\n"
-        finalPovCode += self.getCam()
+        finalPovCode.append("\n//------------------------------------------\n")
+        finalPovCode.append("// Camera ----------------------------------\n")
+        finalPovCode.append(self.getCam())
 
         if self.expLight:
-            finalPovCode += "\n// FreeCAD Light -------------------------------------\n"
-            finalPovCode += self.getFCLight()
+            finalPovCode.append("\n// FreeCAD Light -------------------------------------\n")
+            finalPovCode.append(self.getFCLight())
 
         if self.expEnvironment:
-            finalPovCode += "\n// Background ------------------------------\n"
-            finalPovCode += self.getBackground()
+            finalPovCode.append("\n// Background ------------------------------\n")
+            finalPovCode.append(self.getBackground())
 
-        finalPovCode += "\n//------------------------------------------\n"
+        finalPovCode.append("\n//------------------------------------------\n")
 
         # include user inc file
-        finalPovCode += '\n#include "' + self.incName + '"\n\n'
+        finalPovCode.append('\n#include "' + self.incName + '"\n\n')
 
-        finalPovCode += "// Objects in Scene ------------------------\n"
+        finalPovCode.append("// Objects in Scene ------------------------\n")
 
-        finalPovCode += objPovCode
-
-        # change line breaks for windows
-        if self.os == "Windows":
-            finalPovCode.replace("\n", "\r\n")
-            self.meshFileContent.replace("\n", "\r\n")
-
-        # write mesh file
-        if self.meshFileContent != "":
-            self.meshFile = open(self.meshPath, "w")
-            self.meshFile.write(self.meshFileContent)
-            self.meshFile.close()
+        finalPovCode.extend(objPovCode)
 
         self.writeFile(finalPovCode)  # write the final code to the output file
+
         self.openPovRay()  # start povray
 
     def createPovCode(
@@ -248,11 +424,17 @@ class ExportToPovRay:
         expPhotons,
         expClose,
         expLabel,
-        expMeshDef
+        expMeshDef,
+        depth=0
     ):
         """
         Return the POV-Ray code for the given FreeCAD object.
 
+        The code of the object itself is created by the function registered
+        for its TypeId in self.createFunctions (or for its name in
+        self.createFunctionsByName if it is a Part::FeaturePython object).
+        Objects without such a function are exported as mesh.
+
         ARGUMENTS
         fcObj              : The FreeCAD App object that will be converted
         expPlacement (bool): Should the placement of the given FreeCAD object be exported.
@@ -261,623 +443,632 @@ class ExportToPovRay:
         expClose     (bool): Should the closing bracket of the POV-Ray object be written.
         expLabel     (bool): Should the labe of the given FreeCAD object be exported.
         expMeshDef   (bool): Should the mesh of the given FreeCAD object be created (if it is necessary to create a mesh).
+        depth        (int) : The nesting depth of the object, every line of its code is indented by depth tabs.
 
         RETURN
         povCode (str): The POV-Ray code of the given FreeCAD object.
         """
 
-        if expLabel:
-            povCode = "\n//----- " + stringCorrection(fcObj.Label) + " -----" #add the name of the object
-        else:
-            povCode = ""
-
-        if fcObj.TypeId == "Part::Box":  # Box
-            povBox = (
-                "\nbox { <0,0,0>, <"
-                + str(float(fcObj.Length)) + ", "
-                + str(float(fcObj.Width))  + ", "
-                + str(float(fcObj.Height)) + ">"
-            )
-            povCode += povBox
+        povCode = []  # fragments of the pov code, joined at the end
 
-        elif fcObj.TypeId == "Part::Sphere":  # Sphere
-            radius = fcObj.Radius.getValueAs("mm")
-
-            povSphere = "\nsphere { <0, 0, 0> " + str(radius)
+        if expLabel:
+            povCode.append(
+                self.indentCode("\n//----- " + stringCorrection(fcObj.Label) + " -----", depth)
+            ) #add the name of the object
+
+        typeId = fcObj.TypeId
+        createFunction = self.createFunctions.get(typeId)
+
+        if createFunction is None and typeId == "Part::FeaturePython":
+            name = fcObj.Name
+            for namePrefix, function in self.createFunctionsByName:
+                if name.startswith(namePrefix):
+                    createFunction = function
+                    break
+
+        if createFunction is None:  # not a supported object
+            povCode.append(self.createMesh(
+                fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef, depth
+            ))
+            return "".join(povCode)
+
+        objPovCode = createFunction(
+            fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth
+        )
+        if objPovCode is None:  # nothing to export
+            return ""
 
-            povCode += povSphere
+        povCode.append(objPovCode)
 
-        elif fcObj.TypeId == "Part::Ellipsoid":  # Ellipsoid
-            r1 = fcObj.Radius1.getValueAs("mm").Value
-            r2 = fcObj.Radius2.getValueAs("mm").Value
-            r3 = fcObj.Radius3.getValueAs("mm").Value
+        return "".join(povCode)
 
-            povSphere = "\nsphere { <0, 0, 0> 1\n"
+    def indentCode(self, code, depth):
+        """
+        Indent every line after a line break of the given pov code by depth tabs.
 
-            povSphere += "\tscale <" + str(r2) + ", " + str(r3) + ", " + str(r1) + ">"
+        Every function creating pov code indents only its own code and creates
+        the code of its children with depth + 1, so every line is indented once.
+        """
 
-            povCode += povSphere
+        if depth == 0:
+            return code
 
-        elif fcObj.TypeId == "Part::Cone":  # Cone
-            r1 = fcObj.Radius1.getValueAs("mm").Value
-            c1 = "<0, 0, 0>"
-            r2 = fcObj.Radius2.getValueAs("mm").Value
-            c2 = "<0, 0, " + str(fcObj.Height.getValueAs("mm").Value) + ">"
+        return code.replace("\n", "\n" + "\t" * depth)
 
-            povCone = "\ncone { "
-            povCone += c1 + ", " + str(r1) + "\n    "
-            povCone += c2 + ", " + str(r2)
+    def getObjectModifiers(self, fcObj, expPlacement, expPigment, expPhotons, expClose):
+        """
+        Return the modifiers (material, photons, placement) and the closing bracket of the given FreeCAD object in pov code.
+        Arguments are the same as for createPovCode().
+        """
 
-            povCode += povCone
+        povCode = ["\n"]
 
-        elif fcObj.TypeId == "Part::Cylinder":  # Cylinder
-            r = fcObj.Radius.getValueAs("mm").Value
-            baseP = "<0, 0, 0>"
-            CapP = "<0, 0, " + str(fcObj.Height.getValueAs("mm").Value) + ">"
+        if expPigment:
+            pigment = self.getMaterial(fcObj)
+            if pigment != "":  # test if the object has the standard pigment
+                povCode.append(pigment.replace("\n", "\n\t") + "\n")
 
-            povCylinder = "\ncylinder { "
-            povCylinder += baseP + ", " + CapP + ", " + str(r)
+        if expPhotons:
+            photons = self.getPhotons(fcObj)
+            if photons != "":
+                povCode.append(photons.replace("\n", "\n\t") + "\n")
 
-            povCode += povCylinder
+        if expPlacement:
+            rotation = self.getRotation(fcObj)
+            if rotation != "":  # test if the object is rotated
+                povCode.append("\t" + rotation + "\n")
 
-        elif fcObj.TypeId == "Part::Torus":  # Torus
-            r1 = fcObj.Radius1.getValueAs("mm").Value
-            r2 = fcObj.Radius2.getValueAs("mm").Value
+            translation = self.getTranslation(fcObj)
+            if translation != "":  # test if the object is translated
+                povCode.append("\t" + translation + "\n")
 
-            povTorus = "\ntorus { "
-            povTorus += str(r1) + ", " + str(r2)
+        if expClose:
+            povCode.append("}\n")
 
-            povCode += povTorus
+        return "".join(povCode)
 
-        elif fcObj.TypeId == "Part::Plane":  # Plane
-            width = fcObj.Width.getValueAs("mm").Value
-            length = fcObj.Length.getValueAs("mm").Value
+    def createBox(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a box from Part. Arguments are the same as for createPovCode()."""
 
-            povPlane = "\npolygon { "
-            povPlane += (
-                "5, <0, 0>, <"
-                + str(length) + ", 0>, <"
-                + str(length) + ", "
-                + str(width)  + ">, <0, "
-                + str(width)  + ">, <0, 0>"
-            )
+        length = float(fcObj.Length)
+        width = float(fcObj.Width)
+        height = float(fcObj.Height)
 
-            povCode += povPlane
+        povBox = f"\nbox {{ <0,0,0>, <{length}, {width}, {height}>"
 
-        elif fcObj.TypeId == "Part::Cut":  # Cut
-            children = fcObj.OutList
-            povCut = "\ndifference {\n"
-            for child in children:
-                childCode = self.createPovCode(
-                    child, True, expPigment, expPhotons, True, expLabel, expMeshDef
-                )  # call createPovCode for the child
-                povCut += childCode.replace("\n", "\n\t")  # add the indents
+        return self.indentCode(povBox + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-            povCode += povCut
+    def createSphere(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a sphere from Part. Arguments are the same as for createPovCode()."""
 
-        elif fcObj.TypeId == "Part::MultiFuse" or fcObj.TypeId == "Part::Fuse" or fcObj.TypeId == "Part::Compound":  # Fusion
-            children = fcObj.OutList
-            povFusion = "\nmerge {\n"
-            for child in children:
-                childCode = self.createPovCode(
-                    child, True, expPigment, expPhotons, True, expLabel, expMeshDef
-                )  # call createPovCode for the child
-                povFusion += childCode.replace("\n", "\n\t")  # add the indents
+        radius = fcObj.Radius.getValueAs("mm").Value
 
-            povCode += povFusion
+        povSphere = f"\nsphere {{ <0, 0, 0> {radius}"
 
-        elif fcObj.TypeId == "Part::MultiCommon" or fcObj.TypeId == "Part::Common":  # Common
-            children = fcObj.OutList
-            povCommon = "\nintersection {\n"
-            for child in children:
-                childCode = self.createPovCode(
-                    child, True, expPigment, expPhotons, True, expLabel, expMeshDef
-                )  # call createPovCode for the child
-                povCommon += childCode.replace("\n", "\n\t")  # add the indents
-
-            povCode += povCommon
-
-        elif fcObj.TypeId == "Part::FeaturePython" and fcObj.Name.startswith("Array"):  # Array from Draft workbench
-            povArr = ""
-            if fcObj.ArrayType == "polar":
-                child = fcObj.Base
-                # for child in children:
-                center = (
-                    "<"
-                    + str(fcObj.Center.x) + ", "
-                    + str(fcObj.Center.y) + ", "
-                    + str(fcObj.Center.z) + ">"
-                )
-                axisX = fcObj.Axis.x
-                axisY = fcObj.Axis.y
-                axisZ = fcObj.Axis.z
-                highestAxis = max(axisX, axisY, axisZ)  # get highest value
-                axisX /= highestAxis
-                axisY /= highestAxis
-                axisZ /= highestAxis
-
-
-                axis = "<" + str(axisX) + ", " + str(axisY) + ", " + str(axisZ) + ">"
-                intervalAxis = (
-                    "<"
-                    + str(fcObj.IntervalAxis.x) + ", "
-                    + str(fcObj.IntervalAxis.y) + ", "
-                    + str(fcObj.IntervalAxis.z) + ">"
-                )
-                number = fcObj.NumberPolar
-                angle = fcObj.Angle.getValueAs("deg").Value
+        return self.indentCode(povSphere + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-                declareName = (
-                    stringCorrection(child.Label.capitalize()) + "_" + child.Name
-                )
-                povArr += "\n#declare " + declareName + " = "
-                childCode = self.createPovCode(
-                    child, True, expPigment, expPhotons, True, expLabel, expMeshDef
-                )  # call createPovCode for the child
-                povArr += childCode
-
-                povArr += "\n#declare i = 0;\n"
-                povArr += "#declare endNo = " + str(number) + ";\n"
-                povArr += "#declare axis = " + axis + ";\n"
-                povArr += "#declare arrAngle = " + str(angle) + ";\n"
-                povArr += "#while (i < endNo)\n"
-                povArr += "\tobject { " + declareName + "\n"
-                if fcObj.Center.x != 0 or fcObj.Center.y != 0 or fcObj.Center.z != 0:
-                    povArr += "\t\ttranslate -" + center + "\n"
-
-                povArr += "\t\t#declare rotAngle = i * arrAngle / endNo;\n"
-                povArr += "\t\t#local vX = vaxis_rotate(x, axis, rotAngle);\n"
-                povArr += "\t\t#local vY = vaxis_rotate(y, axis, rotAngle);\n"
-                povArr += "\t\t#local vZ = vaxis_rotate(z, axis, rotAngle);\n"
-                povArr += "\t\ttransform {\n"
-                povArr += "\t\t\tmatrix <vX.x, vX.y, vX.z, vY.x, vY.y, vY.z, vZ.x, vZ.y, vZ.z, 0, 0, 0>\n"
-                povArr += "\t\t}\n"
-
-                if fcObj.Center.x != 0 or fcObj.Center.y != 0 or fcObj.Center.z != 0:
-                    povArr += "\t\ttranslate " + center + "\n"
-
-                if expPlacement:
-                    rotation = self.getRotation(fcObj)
-                    if rotation != "":  # test if the object is rotated
-                        povArr += "        " + rotation + "\n"
-
-                if fcObj.IntervalAxis.x != 0 or fcObj.IntervalAxis.y != 0 or fcObj.IntervalAxis.z != 0:
-                    povArr += "\t\ttranslate " + intervalAxis + " * i\n"
-
-                if expPlacement:
-                    translation = self.getTranslation(fcObj)
-                    if translation != "":  # test if the object is translated
-                        povArr += "\t" + translation + "\n"
-
-                if expPigment:
-                    pigment = self.getMaterial(fcObj)
-                    if pigment != "":  # test if the object has the standard pigment
-                        povArr += "\t" + pigment + "\n"
-
-                if expPhotons:
-                    photons = self.getPhotons(fcObj)
-                    if photons != "":
-                        povArr += "\t" + photons + "\n"
-
-                povArr += "    }\n\t#declare i = i + 1;\n"
-                povArr += "#end\n"
-
-            elif fcObj.ArrayType == "ortho":
-                child = fcObj.Base
-                # for child in children:
-                intervalX = (
-                    "<"
-                    + str(fcObj.IntervalX.x) + ", "
-                    + str(fcObj.IntervalX.y) + ", "
-                    + str(fcObj.IntervalX.z) + ">"
-                )
-                intervalY = (
-                    "<"
-                    + str(fcObj.IntervalY.x) + ", "
-                    + str(fcObj.IntervalY.y) + ", "
-                    + str(fcObj.IntervalY.z) + ">"
-                )
-                intervalZ = (
-                    "<"
-                    + str(fcObj.IntervalZ.x) + ", "
-                    + str(fcObj.IntervalZ.y) + ", "
-                    + str(fcObj.IntervalZ.z) + ">"
-                )
+    def createEllipsoid(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of an ellipsoid from Part. Arguments are the same as for createPovCode()."""
 
-                numX = fcObj.NumberX
-                if numX == 0:
-                    numX = 1
+        r1 = fcObj.Radius1.getValueAs("mm").Value
+        r2 = fcObj.Radius2.getValueAs("mm").Value
+        r3 = fcObj.Radius3.getValueAs("mm").Value
 
-                numY = fcObj.NumberY
-                if numY == 0:
-                    numY = 1
+        povSphere = f"\nsphere {{ <0, 0, 0> 1\n\tscale <{r2}, {r3}, {r1}>"
 
-                numZ = fcObj.NumberZ
-                if numZ == 0:
-                    numZ = 1
+        return self.indentCode(povSphere + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-                declareName = (
-                    stringCorrection(child.Label.capitalize()) + "_" + child.Name
-                )
-                povArr += "\n#declare " + declareName + " = "
-                childCode = self.createPovCode(
-                    child, True, expPigment, expPhotons, True, expLabel, True
-                )  # call createPovCode for the child
-                povArr += childCode
+    def createCone(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a cone from Part. Arguments are the same as for createPovCode()."""
 
-                povArr += "#declare intervalX = " + intervalX + ";\n"
-                povArr += "#declare intervalY = " + intervalY + ";\n"
-                povArr += "#declare intervalZ = " + intervalZ + ";\n\n"
+        r1 = fcObj.Radius1.getValueAs("mm").Value
+        r2 = fcObj.Radius2.getValueAs("mm").Value
+        h = fcObj.Height.getValueAs("mm").Value
 
-                povArr += "#declare numX = " + str(numX) + ";\n"
-                povArr += "#declare ix = 0;\n"
-                povArr += "#while (ix < numX)\n"
+        povCone = f"\ncone {{ <0, 0, 0>, {r1}\n    <0, 0, {h}>, {r2}"
 
-                povArr += "\t#declare numY = " + str(numY) + ";\n"
-                povArr += "\t#declare iy = 0;\n"
-                povArr += "\t#while (iy < numY)\n"
+        return self.indentCode(povCone + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-                povArr += "\t\t#declare numZ = " + str(numZ) + ";\n"
-                povArr += "\t\t#declare iz = 0;\n"
-                povArr += "\t\t#while (iz < numZ)\n"
+    def createCylinder(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a cylinder from Part. Arguments are the same as for createPovCode()."""
 
-                povArr += "\t\t\tobject { " + declareName + "\n"
-                povArr += "\t\t\t\ttranslate intervalX * ix\n"
-                povArr += "\t\t\t\ttranslate intervalY * iy\n"
-                povArr += "\t\t\t\ttranslate intervalZ * iz\n"
+        r = fcObj.Radius.getValueAs("mm").Value
+        h = fcObj.Height.getValueAs("mm").Value
 
-                if expPlacement:
-                    translation = self.getTranslation(fcObj)
-                    if translation != "":  # test if the object is translated
-                        povArr += "\t\t\t\t" + translation + "\n"
+        povCylinder = f"\ncylinder {{ <0, 0, 0>, <0, 0, {h}>, {r}"
 
-                    rotation = self.getRotation(fcObj)
-                    if rotation != "":  # test if the object is rotated
-                        povArr += "\t\t\t\t" + rotation + "\n"
+        return self.indentCode(povCylinder + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-                if expPigment:
-                    pigment = self.getMaterial(fcObj)
-                    if pigment != "":  # test if the object has the standard pigment
-                        povArr += "\t\t\t\t" + pigment + "\n"
+    def createTorus(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a torus from Part. Arguments are the same as for createPovCode()."""
 
-                if expPhotons:
-                    photons = self.getPhotons(fcObj)
-                    if photons != "":
-                        povArr += "\t" + photons + "\n"
+        r1 = fcObj.Radius1.getValueAs("mm").Value
+        r2 = fcObj.Radius2.getValueAs("mm").Value
 
-                povArr += "\t\t\t}\n"
+        povTorus = f"\ntorus {{ {r1}, {r2}"
 
-                povArr += "\t\t\t#declare iz = iz + 1;\n"
-                povArr += "\t\t#end\n"
-                povArr += "\t\t#declare iy = iy + 1;\n"
-                povArr += "\t#end\n"
-                povArr += "\t#declare ix = ix + 1;\n"
-                povArr += "#end\n"
+        return self.indentCode(povTorus + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-            else:
-                povCode += self.createMesh(
-                    fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef
-                )
+    def createPlane(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a plane from Part. Arguments are the same as for createPovCode()."""
 
-            povArr = povArr.replace("\n", "\n\t")
-            povCode += "\nunion {\n"
-            povCode += povArr
-            expPigment = False
-            expPlacement = False
-            expPhotons = False
+        width = fcObj.Width.getValueAs("mm").Value
+        length = fcObj.Length.getValueAs("mm").Value
 
-        elif fcObj.TypeId == "Part::FeaturePython" and fcObj.Name.startswith("Clone"):  # Clone from Draft workbench
-            povClone = ""
+        povPlane = f"\npolygon {{ 5, <0, 0>, <{length}, 0>, <{length}, {width}>, <0, {width}>, <0, 0>"
 
-            children = fcObj.Objects
-            for child in children:
-                povClone += self.createPovCode(
-                    child, False, False, False, False, False, True
-                )
+        return self.indentCode(povPlane + self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth)
 
-            if fcObj.Scale.x != 1 or fcObj.Scale.y != 1 or fcObj.Scale.z != 1:
-                povClone += (
-                    "\n\tscale <"
-                    + str(fcObj.Scale.x) + ", "
-                    + str(fcObj.Scale.y) + ", "
-                    + str(fcObj.Scale.z) + ">"
-                )
+    def createBoolean(self, povOperation, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a boolean operation with the given pov keyword (difference, merge, intersection)."""
 
-            povCode += povClone
+        povCode = [self.indentCode("\n" + povOperation + " {\n", depth)]
 
-        elif fcObj.TypeId == "Part::Extrusion":
-            spline = self.sketchToBezier(fcObj.Base)
+        createPovCode = self.createPovCode
+        childDepth = depth + 1
+        for child in fcObj.OutList:
+            childCode = createPovCode(
+                child, True, expPigment, expPhotons, True, expLabel, expMeshDef, childDepth
+            )  # call createPovCode for the child
+            povCode.append(childCode)
 
-            if not self.isExtrudeSupported(fcObj) or spline == -1:
-                povCode += self.createMesh(
-                    fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef
-                )
-                return povCode  # return because the mesh may not translated and rotated
+        povCode.append(self.indentCode(
+            self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth
+        ))
 
-            startHeight = 0
-            endHeight = fcObj.LengthFwd.getValueAs("mm").Value
+        return "".join(povCode)
 
-            if fcObj.Symmetric:
-                endHeight /= 2
-                startHeight = -endHeight
+    def createCut(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a cut from Part. Arguments are the same as for createPovCode()."""
 
-            startHeight -= fcObj.LengthRev.getValueAs("mm").Value
+        return self.createBoolean(
+            "difference", fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth
+        )
 
-            if not fcObj.Reversed:
-                startHeight *= -1
-                endHeight *= -1
+    def createFusion(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a fusion or compound from Part. Arguments are the same as for createPovCode()."""
 
-            povPad = ""
-            povPad += "\nprism {\n"
-            povPad += "\tbezier_spline\n"
-            povPad += "\t" + str(startHeight) + ", " + str(endHeight) + ", " + str(spline[1])
-            povPad += spline[0].replace("\n", "\n\t") + "\n"  # add the indents
+        return self.createBoolean(
+            "merge", fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth
+        )
 
-            rotation = self.getRotation(fcObj.Base)
-            if rotation != "":  # test if the object is rotated
-                povPad += "\t" + rotation + "\n"
+    def createCommon(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a common from Part. Arguments are the same as for createPovCode()."""
 
-            translation = self.getTranslation(fcObj.Base)
-            if translation != "":  # test if the object is translated
-                povPad += "\t" + translation + "\n"
+        return self.createBoolean(
+            "intersection", fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth
+        )
 
-            povCode += povPad
+    def createArray(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of an array from the Draft workbench. Arguments are the same as for createPovCode()."""
 
-        elif fcObj.TypeId == "Image::ImagePlane":
-            image = fcObj.ImageFile
-            imgType = image[-3:]
+        povCode = []
+        povArr = []
+        if fcObj.ArrayType == "polar":
+            child = fcObj.Base
+            centerVec = fcObj.Center
+            axisVec = fcObj.Axis
+            intervalAxisVec = fcObj.IntervalAxis
+            isCentered = centerVec.x != 0 or centerVec.y != 0 or centerVec.z != 0
 
-            width = fcObj.XSize.getValueAs("mm").Value
-            height = fcObj.YSize.getValueAs("mm").Value
+            center = vectorToPov(centerVec)
+            axisVec.normalize()  # axisVec is a copy, the array isn't changed
 
-            povImg = "\npolygon { "
-            povImg += (
-                "5, <0, 0>, <"
-                + str(width)  + ", 0>, <"
-                + str(width)  + ", "
-                + str(height) + ">, <0, "
-                + str(height) + ">, <0, 0>"
+            declareName = self.declareArrayBase(
+                povArr, child, expPigment, expPhotons, expLabel, expMeshDef, depth + 1
             )
 
-            povPigment = "\npigment {\n"
-            povPigment += "\timage_map {\n"
-            povPigment += "\t\t" + imgType + ' "' + image + '"\n'
-            povPigment += "\t\tmap_type 0\n"
-            povPigment += "\t}\n"
-            povPigment += "\tscale <" + str(width) + ", " + str(height) + ", 1>\n"
-            povPigment += "}\n"
-
-            povImg += povPigment.replace("\n", "\n\t")
-            povImg += (
-                "\ttranslate -<" + str(width / 2) + ", " + str(height / 2) + ", 0>\n"
-            )
+            arrValues = {
+                "declareName": declareName,
+                "number": fcObj.NumberPolar,
+                "axis": vectorToPov(axisVec),
+                "angle": fcObj.Angle.getValueAs("deg").Value,
+                "centerTranslation": "",
+                "centerBackTranslation": "",
+                "rotation": "",
+                "intervalTranslation": "",
+                "translation": "",
+                "pigment": "",
+                "photons": "",
+            }
+
+            if isCentered:
+                arrValues["centerTranslation"] = "\t\ttranslate -" + center + "\n"
+                arrValues["centerBackTranslation"] = "\t\ttranslate " + center + "\n"
+
+            if intervalAxisVec.x != 0 or intervalAxisVec.y != 0 or intervalAxisVec.z != 0:
+                arrValues["intervalTranslation"] = "\t\ttranslate " + vectorToPov(intervalAxisVec) + " * i\n"
 
-            expPigment = False
-            povCode += povImg
+            if expPlacement:
+                rotation = self.getRotation(fcObj)
+                if rotation != "":  # test if the object is rotated
+                    arrValues["rotation"] = "        " + rotation + "\n"
 
-        elif fcObj.TypeId == "App::Part":  # Part
-            povPart = "\nunion {\n"
+                translation = self.getTranslation(fcObj)
+                if translation != "":  # test if the object is translated
+                    arrValues["translation"] = "\t" + translation + "\n"
 
-            children = fcObj.OutList
-            for child in children:
-                guiChild = child.ViewObject
-                if guiChild.Visibility:
-                    childCode = self.createPovCode(
-                        child, True, expPigment, expPhotons, True, expLabel, expMeshDef
-                    )  # call createPovCode for the child
-                    povPart += childCode.replace("\n", "\n\t")  # add the indents
+            if expPigment:
+                pigment = self.getMaterial(fcObj)
+                if pigment != "":  # test if the object has the standard pigment
+                    arrValues["pigment"] = "\t" + pigment + "\n"
 
-            povCode += povPart
-            expPigment = False  # part has no pigment
+            if expPhotons:
+                photons = self.getPhotons(fcObj)
+                if photons != "":
+                    arrValues["photons"] = "\t" + photons + "\n"
 
-        elif fcObj.TypeId == "PartDesign::Body":  # Body from PartDesign
-            if not self.isBodySupported(fcObj):
-                povCode += self.createMesh(
-                    fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef
-                )
-                return povCode  # return because the mesh may not translated and rotated
-
-            povBody = "\nunion {\n"
-            if fcObj.Tip != None:
-                povBody += self.createPovCode(
-                    fcObj.Tip, True, True, True, True, True, True
-                ).replace(
-                    "\n", "\n\t"
-                )  # add child code and indents
-                povCode += povBody
-            else:
-                return ""
+            arrCode = self.polarArrayTemplate.format_map(arrValues)
+            povArr.append(self.indentCode(arrCode, depth + 1))
 
-        elif fcObj.TypeId == "PartDesign::Pad" or fcObj.TypeId == "PartDesign::Pocket":  # Pad or Pocket from PartDesign
-            povPad = ""
-            spline = self.sketchToBezier(fcObj.Profile[0])
+        elif fcObj.ArrayType == "ortho":
+            child = fcObj.Base
+            intervalXVec = fcObj.IntervalX
+            intervalYVec = fcObj.IntervalY
+            intervalZVec = fcObj.IntervalZ
 
-            if (
-                (self.isSketchSupported(fcObj.Profile[0]) == False)
-                or spline == -1
-                or (self.isPadPocketSupported(fcObj) == False)
-            ):
-                povPad += self.createMesh(
-                    fcObj, expPlacement, True, expPhotons, expClose, expMeshDef
-                )
-                povCode += povPad
-                return povCode
-
-            startHeight = 0
-            if fcObj.TypeId == "PartDesign::Pocket":
-                startHeight = -0.0001
-            endHeight = fcObj.Length.getValueAs("mm").Value
-            if fcObj.Midplane:
-                endHeight /= 2
-                startHeight = -endHeight
-            if not fcObj.Reversed:
-                startHeight *= -1
-                endHeight *= -1
-            if fcObj.TypeId == "PartDesign::Pocket":
-                startHeight *= -1
-                endHeight *= -1
-
-            try:
-                if fcObj.TypeId == "PartDesign::Pocket":
-                    povPad += "\ndifference {\n"
-                else:
-                    povPad += "\nunion {\n"
-            except:
-                povPad += "\nunion {\n"
-
-            if fcObj.BaseFeature != None:
-                povBase = self.createPovCode(
-                    fcObj.BaseFeature, True, True, True, True, True, True
-                )
-                povPad += povBase.replace("\n", "\n\t")  # add the indents
-
-            povPad += "\n\tprism {\n"
-            povPad += "\t\tbezier_spline\n"
-            povPad += (
-                "\t\t"
-                + str(startHeight) + ", "
-                + str(endHeight) + ", "
-                + str(spline[1])
+            declareName = self.declareArrayBase(
+                povArr, child, expPigment, expPhotons, expLabel, True, depth + 1
             )
-            povPad += spline[0].replace("\n", "\n\t\t") + "\n"  # add the indents
+
+            arrValues = {
+                "declareName": declareName,
+                "intervalX": vectorToPov(intervalXVec),
+                "intervalY": vectorToPov(intervalYVec),
+                "intervalZ": vectorToPov(intervalZVec),
+                "numX": fcObj.NumberX or 1,  # 0 elements are exported as 1
+                "numY": fcObj.NumberY or 1,
+                "numZ": fcObj.NumberZ or 1,
+                "translation": "",
+                "rotation": "",
+                "pigment": "",
+                "photons": "",
+            }
 
             if expPlacement:
-                rotation = self.getRotation(fcObj.Profile[0])
+                translation = self.getTranslation(fcObj)
+                if translation != "":  # test if the object is translated
+                    arrValues["translation"] = "\t\t\t\t" + translation + "\n"
+
+                rotation = self.getRotation(fcObj)
                 if rotation != "":  # test if the object is rotated
-                    povPad += "\t\t" + rotation + "\n"
+                    arrValues["rotation"] = "\t\t\t\t" + rotation + "\n"
 
-                translation = self.getTranslation(fcObj.Profile[0])
-                if translation != "":  # test if the object is translated
-                    povPad += "\t\t" + translation + "\n"
-            else:
-                rotation = "\t\trotate <-90, 0, 0>"
-                povPad += rotation
+            if expPigment:
+                pigment = self.getMaterial(fcObj)
+                if pigment != "":  # test if the object has the standard pigment
+                    arrValues["pigment"] = "\t\t\t\t" + pigment + "\n"
 
-            povPad += "\n\t}\n"
+            if expPhotons:
+                photons = self.getPhotons(fcObj)
+                if photons != "":
+                    arrValues["photons"] = "\t" + photons + "\n"
 
-            if expClose:
-                povPad += "\n}\n"
+            arrCode = self.orthoArrayTemplate.format_map(arrValues)
+            if not povArr:  # the base is already declared, start in a new line after "union {"
+                arrCode = "\n" + arrCode
+            povArr.append(self.indentCode(arrCode, depth + 1))
 
-            povCode += povPad
-            return povCode
+        else:
+            povCode.append(self.createMesh(
+                fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef, depth
+            ))
 
+        povCode.append(self.indentCode("\nunion {\n", depth))
+        povCode += povArr
+        # the placement, material and photons are already applied to the array elements
+        povCode.append(self.indentCode(self.getObjectModifiers(fcObj, False, False, False, expClose), depth))
 
-        elif fcObj.TypeId == "Part::FeaturePython" and fcObj.Name.startswith("PointLight"):  # PointLight
-            povLight = "\nlight_source { "
-            povLight += "<0, 0, 0>"
-            povLight += (
-                "\n\tcolor rgb<"
-                + str(fcObj.Color[0]) + ", "
-                + str(fcObj.Color[1]) + ", "
-                + str(fcObj.Color[2]) + ">"
-            )
+        return "".join(povCode)
 
-            if fcObj.FadeDistance.getValueAs("mm").Value != 0 and fcObj.FadePower != 0:
-                povLight += "\n\tfade_distance " + str(
-                    fcObj.FadeDistance.getValueAs("mm").Value
-                )
-                povLight += "\n\tfade_power " + str(fcObj.FadePower)
+    def declareArrayBase(self, povCode, child, expPigment, expPhotons, expLabel, expMeshDef, depth):
+        """
+        Append the declaration of the base object of an array to povCode and return its declared name.
+        A base object that is already declared in this export with the same options isn't declared again.
+        """
+
+        declareKey = (child.Name, expPigment, expPhotons, expMeshDef)
+        declareName = self.declaredNames.get(declareKey)
+        if declareName is not None:
+            return declareName
+
+        declareName = stringCorrection(child.Label.capitalize()) + "_" + child.Name
+
+        # the same object declared with other options gets a numbered name
+        numOfDeclarations = self.declareCounts.get(child.Name, 0)
+        if numOfDeclarations != 0:
+            declareName += "_" + str(numOfDeclarations)
+        self.declareCounts[child.Name] = numOfDeclarations + 1
+        povCode.append(self.indentCode("\n#declare " + declareName + " = ", depth))
+        childCode = self.createPovCode(
+            child, True, expPigment, expPhotons, True, expLabel, expMeshDef, depth
+        )  # call createPovCode for the child
+        povCode.append(childCode)
+
+        self.declaredNames[declareKey] = declareName
+        return declareName
+
+    def createClone(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a clone from the Draft workbench. Arguments are the same as for createPovCode()."""
+
+        povCode = []
+
+        children = fcObj.Objects
+        for child in children:
+            povCode.append(self.createPovCode(
+                child, False, False, False, False, False, True, depth
+            ))
+
+        cloneCode = []
+        scale = fcObj.Scale
+        if scale.x != 1 or scale.y != 1 or scale.z != 1:
+            cloneCode.append("\n\tscale " + vectorToPov(scale))
 
-            povCode += povLight
+        cloneCode.append(self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose))
+        povCode.append(self.indentCode("".join(cloneCode), depth))
 
-            expPigment = False
+        return "".join(povCode)
 
-        elif fcObj.TypeId == "Part::FeaturePython" and fcObj.Name.startswith("AreaLight"):  # AreaLight
-            povLight = "\nlight_source { "
-            povLight += "<0, 0, 0>"
-            povLight += (
-                "\n\tcolor rgb<"
-                + str(fcObj.Color[0]) + ", "
-                + str(fcObj.Color[1]) + ", "
-                + str(fcObj.Color[2]) + ">"
+    def createExtrusion(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of an extrusion from Part. Arguments are the same as for createPovCode()."""
+
+        sketch = fcObj.Base
+        spline = self.sketchToBezier(sketch)
+
+        if not self.isExtrudeSupported(fcObj) or spline == -1:
+            # return without modifiers because the mesh may not translated and rotated
+            return self.createMesh(
+                fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef, depth
             )
-            povLight += "\n\tarea_light"
 
-            povLight += "\n\t<" + str(fcObj.Length.getValueAs("mm").Value) + ", 0, 0>, "
-            povLight += "<0, " + str(fcObj.Width.getValueAs("mm").Value) + ", 0>"
+        startHeight = 0
+        endHeight = fcObj.LengthFwd.getValueAs("mm").Value
 
-            povLight += "\n\t" + str(fcObj.LengthLights) + ", " + str(fcObj.WidthLights)
+        if fcObj.Symmetric:
+            endHeight /= 2
+            startHeight = -endHeight
 
-            povLight += "\n\tadaptive " + str(fcObj.Adaptive)
+        startHeight -= fcObj.LengthRev.getValueAs("mm").Value
 
-            if fcObj.AreaIllumination:
-                povLight += "\n\tarea_illumination on"
+        if not fcObj.Reversed:
+            startHeight *= -1
+            endHeight *= -1
 
-            if fcObj.Jitter:
-                povLight += "\n\tjitter"
+        povCode = ["\nprism {\n"]
+        povCode.append("\tbezier_spline\n")
+        povCode.append(f"\t{startHeight}, {endHeight}, {spline[1]}")
+        povCode.append(spline[0].replace("\n", "\n\t") + "\n")  # add the indents
 
-            if fcObj.FadeDistance.getValueAs("mm").Value != 0 and fcObj.FadePower != 0:
-                povLight += "\n\tfade_distance " + str(
-                    fcObj.FadeDistance.getValueAs("mm").Value
-                )
-                povLight += "\n\tfade_power " + str(fcObj.FadePower)
+        rotation = self.getRotation(sketch)
+        if rotation != "":  # test if the object is rotated
+            povCode.append("\t" + rotation + "\n")
+
+        translation = self.getTranslation(sketch)
+        if translation != "":  # test if the object is translated
+            povCode.append("\t" + translation + "\n")
+
+        povCode.append(self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose))
+
+        return self.indentCode("".join(povCode), depth)
+
+    def createImagePlane(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of an image plane. Arguments are the same as for createPovCode()."""
+
+        image = fcObj.ImageFile
+        imgType = image[-3:]
+
+        width = fcObj.XSize.getValueAs("mm").Value
+        height = fcObj.YSize.getValueAs("mm").Value
+
+        povImg = f"\npolygon {{ 5, <0, 0>, <{width}, 0>, <{width}, {height}>, <0, {height}>, <0, 0>"
 
-            povCode += povLight
+        povPigment = (
+            "\npigment {\n"
+            "\timage_map {\n"
+            f'\t\t{imgType} "{image}"\n'
+            "\t\tmap_type 0\n"
+            "\t}\n"
+            f"\tscale <{width}, {height}, 1>\n"
+            "}\n"
+        )
+
+        povImg += povPigment.replace("\n", "\n\t")
+        povImg += f"\ttranslate -<{width / 2}, {height / 2}, 0>\n"
+
+        # the image is the pigment
+        return self.indentCode(povImg + self.getObjectModifiers(fcObj, expPlacement, False, expPhotons, expClose), depth)
+
+    def createPart(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a std part. Arguments are the same as for createPovCode()."""
+
+        povCode = [self.indentCode("\nunion {\n", depth)]
 
-            expPigment = False
+        createPovCode = self.createPovCode
+        childDepth = depth + 1
+        for child in fcObj.OutList:
+            if child.ViewObject.Visibility:
+                childCode = createPovCode(
+                    child, True, expPigment, expPhotons, True, expLabel, expMeshDef, childDepth
+                )  # call createPovCode for the child
+                povCode.append(childCode)
+
+        # part has no pigment
+        povCode.append(self.indentCode(
+            self.getObjectModifiers(fcObj, expPlacement, False, expPhotons, expClose), depth
+        ))
+
+        return "".join(povCode)
 
-        elif fcObj.TypeId == "Part::FeaturePython" and fcObj.Name.startswith("SpotLight"):  # SpotLight
-            povLight = "\nlight_source { "
-            povLight += "<0, 0, 0>"
-            povLight += (
-                "\n\tcolor rgb<"
-                + str(fcObj.Color[0]) + ", "
-                + str(fcObj.Color[1]) + ", "
-                + str(fcObj.Color[2]) + ">"
+    def createBody(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a body from PartDesign. Arguments are the same as for createPovCode()."""
+
+        if not self.isBodySupported(fcObj):
+            # return without modifiers because the mesh may not translated and rotated
+            return self.createMesh(
+                fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef, depth
             )
-            povLight += "\n\tspotlight"
-            povLight += "\n\tpoint_at <0, -1, 0>"
 
-            povLight += "\n\tradius " + str(fcObj.Radius.getValueAs("deg").Value)
-            povLight += "\n\tfalloff " + str(fcObj.FallOff.getValueAs("deg").Value)
-            povLight += "\n\ttightness " + str(fcObj.Tightness)
+        if fcObj.Tip == None:
+            return None  # empty body, nothing to export
 
-            if fcObj.FadeDistance.getValueAs("mm").Value != 0 and fcObj.FadePower != 0:
-                povLight += "\n\tfade_distance " + str(
-                    fcObj.FadeDistance.getValueAs("mm").Value
-                )
-                povLight += "\n\tfade_power " + str(fcObj.FadePower)
+        povCode = [self.indentCode("\nunion {\n", depth)]
+        povCode.append(self.createPovCode(
+            fcObj.Tip, True, True, True, True, True, True, depth + 1
+        ))  # add child code
 
-            povCode += povLight
+        povCode.append(self.indentCode(
+            self.getObjectModifiers(fcObj, expPlacement, expPigment, expPhotons, expClose), depth
+        ))
 
-            expPigment = False
+        return "".join(povCode)
 
-        else:  # not a supported object
-            povCode += self.createMesh(
-                fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef
+    def createPadPocket(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a pad or pocket from PartDesign. Arguments are the same as for createPovCode()."""
+
+        sketch = fcObj.Profile[0]
+        isPocket = fcObj.TypeId == "PartDesign::Pocket"
+        if self.isSketchSupported(sketch) and self.isPadPocketSupported(fcObj):
+            spline = self.sketchToBezier(sketch)
+        else:
+            spline = -1
+
+        if spline == -1:
+            return self.createMesh(
+                fcObj, expPlacement, True, expPhotons, expClose, expMeshDef, depth
             )
-            return povCode  # return because the mesh may not translated and rotated
 
-        povCode += "\n"
+        startHeight = 0
+        if isPocket:
+            startHeight = -0.0001
+        endHeight = fcObj.Length.getValueAs("mm").Value
+        if fcObj.Midplane:
+            endHeight /= 2
+            startHeight = -endHeight
+        if not fcObj.Reversed:
+            startHeight *= -1
+            endHeight *= -1
+        if isPocket:
+            startHeight *= -1
+            endHeight *= -1
+
+        if isPocket:
+            povCode = [self.indentCode("\ndifference {\n", depth)]
+        else:
+            povCode = [self.indentCode("\nunion {\n", depth)]
 
-        if expPigment:
-            pigment = self.getMaterial(fcObj)
-            if pigment != "":  # test if the object has the standard pigment
-                povCode += pigment.replace("\n", "\n\t") + "\n"
+        baseFeature = fcObj.BaseFeature
+        if baseFeature != None:
+            povBase = self.createPovCode(
+                baseFeature, True, True, True, True, True, True, depth + 1
+            )
+            povCode.append(povBase)
 
-        if expPhotons:
-            photons = self.getPhotons(fcObj)
-            if photons != "":
-                povCode += photons.replace("\n", "\n\t") + "\n"
+        prismCode = []
+        prismCode.append("\n\tprism {\n")
+        prismCode.append("\t\tbezier_spline\n")
+        prismCode.append(f"\t\t{startHeight}, {endHeight}, {spline[1]}")
+        prismCode.append(spline[0].replace("\n", "\n\t\t") + "\n")  # add the indents
 
         if expPlacement:
-            rotation = self.getRotation(fcObj)
+            rotation = self.getRotation(sketch)
             if rotation != "":  # test if the object is rotated
-                povCode += "\t" + rotation + "\n"
+                prismCode.append("\t\t" + rotation + "\n")
 
-            translation = self.getTranslation(fcObj)
+            translation = self.getTranslation(sketch)
             if translation != "":  # test if the object is translated
-                povCode += "\t" + translation + "\n"
+                prismCode.append("\t\t" + translation + "\n")
+        else:
+            rotation = "\t\trotate <-90, 0, 0>"
+            prismCode.append(rotation)
+
+        prismCode.append("\n\t}\n")
 
         if expClose:
-            povCode += "}\n"
+            prismCode.append("\n}\n")
+
+        povCode.append(self.indentCode("".join(prismCode), depth))
+
+        return "".join(povCode)
+
+    def createPointLight(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a point light. Arguments are the same as for createPovCode()."""
+
+        color = fcObj.Color
+        povLight = [self.pointLightTemplate.format(red=color[0], green=color[1], blue=color[2])]
+
+        fadeDistance = fcObj.FadeDistance.getValueAs("mm").Value
+        fadePower = fcObj.FadePower
+        if fadeDistance != 0 and fadePower != 0:
+            povLight.append(self.fadeTemplate.format(fadeDistance=fadeDistance, fadePower=fadePower))
 
-        return povCode
+        # lights have no pigment
+        povLight.append(self.getObjectModifiers(fcObj, expPlacement, False, expPhotons, expClose))
+
+        return self.indentCode("".join(povLight), depth)
+
+    def createAreaLight(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of an area light. Arguments are the same as for createPovCode()."""
+
+        color = fcObj.Color
+        povLight = [self.areaLightTemplate.format(
+            red=color[0],
+            green=color[1],
+            blue=color[2],
+            length=fcObj.Length.getValueAs("mm").Value,
+            width=fcObj.Width.getValueAs("mm").Value,
+            lengthLights=fcObj.LengthLights,
+            widthLights=fcObj.WidthLights,
+            adaptive=fcObj.Adaptive,
+        )]
+
+        if fcObj.AreaIllumination:
+            povLight.append("\n\tarea_illumination on")
+
+        if fcObj.Jitter:
+            povLight.append("\n\tjitter")
+
+        fadeDistance = fcObj.FadeDistance.getValueAs("mm").Value
+        fadePower = fcObj.FadePower
+        if fadeDistance != 0 and fadePower != 0:
+            povLight.append(self.fadeTemplate.format(fadeDistance=fadeDistance, fadePower=fadePower))
+
+        # lights have no pigment
+        povLight.append(self.getObjectModifiers(fcObj, expPlacement, False, expPhotons, expClose))
+
+        return self.indentCode("".join(povLight), depth)
+
+    def createSpotLight(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expLabel, expMeshDef, depth):
+        """Return the pov code of a spot light. Arguments are the same as for createPovCode()."""
+
+        color = fcObj.Color
+        povLight = [self.spotLightTemplate.format(
+            red=color[0],
+            green=color[1],
+            blue=color[2],
+            radius=fcObj.Radius.getValueAs("deg").Value,
+            falloff=fcObj.FallOff.getValueAs("deg").Value,
+            tightness=fcObj.Tightness,
+        )]
+
+        fadeDistance = fcObj.FadeDistance.getValueAs("mm").Value
+        fadePower = fcObj.FadePower
+        if fadeDistance != 0 and fadePower != 0:
+            povLight.append(self.fadeTemplate.format(fadeDistance=fadeDistance, fadePower=fadePower))
+
+        # lights have no pigment
+        povLight.append(self.getObjectModifiers(fcObj, expPlacement, False, expPhotons, expClose))
+
+        return self.indentCode("".join(povLight), depth)
 
 
     def sketchToBezier(self, sketch):
         """Create a pov bezier_spline from a sketch."""
 
+        pointType = Part.Point
+        lineSegmentType = Part.LineSegment
+        circleType = Part.Circle
+        arcOfCircleType = Part.ArcOfCircle
+
         try:
             povSpline = "\n"
 
@@ -886,75 +1077,93 @@ class ExportToPovRay:
             # delete construction geometry and points
             unsortedLines = []
             for facadeLine in sketch.GeometryFacadeList:
-                try:
-                    construction = facadeLine.Geometry.Construction # old versions of FC
-                except:
+                geometry = facadeLine.Geometry
+                construction = getattr(geometry, "Construction", None)  # old versions of FC
+                if construction is None:
                     construction = facadeLine.Construction  # recent versions of FC
 
-                if not construction or type(facadeLine.Geometry) == Part.Point:
-                    unsortedLines.append(facadeLine.Geometry)
+                if not construction or isinstance(geometry, pointType):
+                    unsortedLines.append(geometry)
 
             numOfPoints = 0  # counter for povray bezier points
 
+            # rounded end points of all lines and the indices of the lines at every point
+            startPoints = []
+            endPoints = []
+            linesAtPoint = {}
+            for i, line in enumerate(unsortedLines):
+                if isinstance(line, circleType):  # circles have no end points
+                    startPoints.append(None)
+                    endPoints.append(None)
+                    continue
+
+                startPoint = self.getPointKey(line.StartPoint)
+                endPoint = self.getPointKey(line.EndPoint)
+                startPoints.append(startPoint)
+                endPoints.append(endPoint)
+
+                linesAtPoint.setdefault(startPoint, []).append(i)
+                if endPoint != startPoint:
+                    linesAtPoint.setdefault(endPoint, []).append(i)
+
             sortedLines = []  # lines in the right order
+            isSorted = [False] * len(unsortedLines)  # sorted lines are marked
 
-            while unsortedLines: #until the unsortedLines array is empty
-                sortedLines.append(unsortedLines[0]) # put first line in sorted lines array
-                startLine = unsortedLines[0]         # and
-                del unsortedLines[0]                 # delete from unsorted lines array
-
-                if (
-                    type(startLine) != Part.Circle
-                    and type(sortedLines[len(sortedLines) - 1]) != Part.Circle
-                ):
-                    while not self.isSamePoint(
-                        startLine.StartPoint, sortedLines[len(sortedLines) - 1].EndPoint
-                    ):  # search for matching line
-                        # handling of -1 missing
-                        nextLineI = self.getNextLine(
-                            unsortedLines, sortedLines[len(sortedLines) - 1]
-                        )
+            for startI in range(len(unsortedLines)): #until all lines are sorted
+                if isSorted[startI]:
+                    continue
+
+                startLine = unsortedLines[startI]
+                sortedLines.append(startLine) # put first unsorted line in sorted lines array
+                isSorted[startI] = True
+
+                if not isinstance(startLine, circleType):
+                    firstPoint = startPoints[startI]  # the wire is closed when it ends here again
+                    lastEndPoint = endPoints[startI]  # end point of the last sorted line
+
+                    while firstPoint != lastEndPoint:  # search for matching line
+                        # the first unsorted line starting or ending at the end of the last line
+                        nextLineI = -1
+                        for i in linesAtPoint.get(lastEndPoint, ()):
+                            if not isSorted[i]:
+                                nextLineI = i
+                                break
+
+                        if nextLineI == -1:
+                            raise ValueError("The lines of the sketch aren't closed.")
+
+                        nextLine = unsortedLines[nextLineI]
 
                         # change direction
-                        if self.isSamePoint(
-                            sortedLines[len(sortedLines) - 1].EndPoint,
-                            unsortedLines[nextLineI].EndPoint,
-                        ):
-                            unsortedLines[nextLineI].reverse()
+                        if lastEndPoint == endPoints[nextLineI]:
+                            nextLine.reverse()
+                            lastEndPoint = startPoints[nextLineI]
+                        else:
+                            lastEndPoint = endPoints[nextLineI]
 
-                        sortedLines.append(unsortedLines[nextLineI])
-                        del unsortedLines[nextLineI]
+                        sortedLines.append(nextLine)
+                        isSorted[nextLineI] = True
 
         except:
             return -1
 
         # create povSpline
         for line in sortedLines:
-            if type(line) == Part.LineSegment:
-                povSpline += (
-                    "<"
-                    + str(round(line.StartPoint.x, 3)) + ", "
-                    + str(round(line.StartPoint.y, 3)) + ">, "
-                )
-                povSpline += (
-                    "<"
-                    + str(round(line.StartPoint.x, 3)) + ", "
-                    + str(round(line.StartPoint.y, 3)) + ">, "
-                )
-                povSpline += (
-                    "<"
-                    + str(round(line.EndPoint.x, 3)) + ", "
-                    + str(round(line.EndPoint.y, 3)) + ">, "
-                )
+            if isinstance(line, lineSegmentType):
+                # every point is written twice (as position and control point)
+                startPoint = line.StartPoint
+                endPoint = line.EndPoint
+                povStartPoint = f"<{round(startPoint.x, 3)}, {round(startPoint.y, 3)}>"
+                povEndPoint = f"<{round(endPoint.x, 3)}, {round(endPoint.y, 3)}>"
+
                 povSpline += (
-                    "<"
-                    + str(round(line.EndPoint.x, 3)) + ", "
-                    + str(round(line.EndPoint.y, 3)) + ">//line\n"
+                    povStartPoint + ", " + povStartPoint + ", "
+                    + povEndPoint + ", " + povEndPoint + "//line\n"
                 )
 
                 numOfPoints += 4
 
-            elif type(line) == Part.Circle:
+            elif isinstance(line, circleType):
                 r = line.Radius
                 cx = round(line.Center.x, 3)
                 cy = round(line.Center.y, 3)
@@ -962,50 +1171,22 @@ class ExportToPovRay:
                     (4.0 / 3.0) * math.tan(math.pi / 8.0) * r, 3
                 )  # distance to control point
 
-                posP0 = "<" + str(cx) + ", " + str(cy + r) + ">"
-                controlP0_0 = "<" + str(cx - dTC) + ", " + str(cy + r) + ">"
-                controlP0_1 = "<" + str(cx + dTC) + ", " + str(cy + r) + ">"
-
-                posP1 = "<" + str(cx + r) + ", " + str(cy) + ">"
-                controlP1_0 = "<" + str(cx + r) + ", " + str(cy + dTC) + ">"
-                controlP1_1 = "<" + str(cx + r) + ", " + str(cy - dTC) + ">"
+                # coordinates of the four points on the circle and of their control points
+                left = cx - r
+                right = cx + r
+                top = cy + r
+                bottom = cy - r
 
-                posP2 = "<" + str(cx) + ", " + str(cy - r) + ">"
-                controlP2_0 = "<" + str(cx + dTC) + ", " + str(cy - r) + ">"
-                controlP2_1 = "<" + str(cx - dTC) + ", " + str(cy - r) + ">"
-
-                posP3 = "<" + str(cx - r) + ", " + str(cy) + ">"
-                controlP3_0 = "<" + str(cx - r) + ", " + str(cy - dTC) + ">"
-                controlP3_1 = "<" + str(cx - r) + ", " + str(cy + dTC) + ">"
-
-                povSpline += (
-                    posP0 + ", "
-                    + controlP0_1 + ", "
-                    + controlP1_0 + ", "
-                    + posP1 + "//circle\n"
-                )
-                povSpline += (
-                    posP1 + ", "
-                    + controlP1_1 + ", "
-                    + controlP2_0 + ", "
-                    + posP2 + "//circle\n"
-                )
-                povSpline += (
-                    posP2 + ", "
-                    + controlP2_1 + ", "
-                    + controlP3_0 + ", "
-                    + posP3 + "//circle\n"
-                )
                 povSpline += (
-                    posP3 + ", "
-                    + controlP3_1 + ", "
-                    + controlP0_0 + ", "
-                    + posP0 + "//circle\n"
+                    f"<{cx}, {top}>, <{cx + dTC}, {top}>, <{right}, {cy + dTC}>, <{right}, {cy}>//circle\n"
+                    f"<{right}, {cy}>, <{right}, {cy - dTC}>, <{cx + dTC}, {bottom}>, <{cx}, {bottom}>//circle\n"
+                    f"<{cx}, {bottom}>, <{cx - dTC}, {bottom}>, <{left}, {cy - dTC}>, <{left}, {cy}>//circle\n"
+                    f"<{left}, {cy}>, <{left}, {cy + dTC}>, <{cx - dTC}, {top}>, <{cx}, {top}>//circle\n"
                 )
 
                 numOfPoints += 16
 
-            elif type(line) == Part.ArcOfCircle:
+            elif isinstance(line, arcOfCircleType):
                 arc = line
                 a = arc.LastParameter - arc.FirstParameter
 
@@ -1016,72 +1197,59 @@ class ExportToPovRay:
                 else:
                     reversed = False
 
-                # split arc in segments <90deg
-                if a % math.pi / 2 == 0:
-                    numOfSegments = a / (math.pi / 2)
-                else:
-                    numOfSegments = math.floor(a / (math.pi / 2)) + 1
-
-                if numOfSegments % 1 != 0.0:
-                    raise ValueError("numOfSegments is not an integer.")
-
-                numOfSegments = int(numOfSegments)
+                # split arc in segments <=90deg
+                # (the tolerance keeps e.g. a quarter circle in one segment despite rounding errors)
+                numOfSegments = max(1, math.ceil(a / (math.pi / 2) - 1e-9))
                 angleOfSegment = a / numOfSegments
 
+                firstParameter = arc.FirstParameter
+                lastParameter = arc.LastParameter
+
                 segments = []
                 for i in range(numOfSegments):
                     if reversed:
                         segment = {
-                            "startAngle": arc.LastParameter - i * angleOfSegment,
-                            "endAngle": arc.LastParameter - (i + 1) * angleOfSegment,
+                            "startAngle": lastParameter - i * angleOfSegment,
+                            "endAngle": lastParameter - (i + 1) * angleOfSegment,
                             "direction": "clockwise",
                         }
                     else:
                         segment = {
-                            "startAngle": arc.FirstParameter + i * angleOfSegment,
-                            "endAngle": arc.FirstParameter + (i + 1) * angleOfSegment,
+                            "startAngle": firstParameter + i * angleOfSegment,
+                            "endAngle": firstParameter + (i + 1) * angleOfSegment,
                             "direction": "anticlockwise",
                         }
 
                     segments.append(segment)
 
                 # segment to bezier
-                for segment in segments:
-                    numOfSegmentsPerCircle = (2 * math.pi) / angleOfSegment
-                    controlDistance = (
-                        (4.0 / 3.0)
-                        * math.tan(math.pi / (2 * numOfSegmentsPerCircle))
-                        * arc.Radius
-                    )
-
-                    startX = round(
-                        math.cos(segment["startAngle"]) * arc.Radius + arc.Location.x, 3
-                    )
-                    startY = round(
-                        math.sin(segment["startAngle"]) * arc.Radius + arc.Location.y, 3
-                    )
-                    startControlX = round(
-                        -math.cos(math.pi / 2 - segment["startAngle"])
-                        * controlDistance,
-                        3,
-                    )
-                    startControlY = round(
-                        math.sin(math.pi / 2 - segment["startAngle"]) * controlDistance,
-                        3,
-                    )
+                radius = arc.Radius
+                location = arc.Location
+                locationX = location.x
+                locationY = location.y
+                numOfSegmentsPerCircle = (2 * math.pi) / angleOfSegment
+                controlDistance = (
+                    (4.0 / 3.0)
+                    * math.tan(math.pi / (2 * numOfSegmentsPerCircle))
+                    * radius
+                )
 
-                    endX = round(
-                        math.cos(segment["endAngle"]) * arc.Radius + arc.Location.x, 3
-                    )
-                    endY = round(
-                        math.sin(segment["endAngle"]) * arc.Radius + arc.Location.y, 3
-                    )
-                    endControlX = round(
-                        math.cos(math.pi / 2 - segment["endAngle"]) * controlDistance, 3
-                    )
-                    endControlY = round(
-                        -math.sin(math.pi / 2 - segment["endAngle"]) * controlDistance, 3
-                    )
+                for segment in segments:
+                    # cos(pi/2 - angle) = sin(angle), sin(pi/2 - angle) = cos(angle)
+                    cosStart = math.cos(segment["startAngle"])
+                    sinStart = math.sin(segment["startAngle"])
+                    cosEnd = math.cos(segment["endAngle"])
+                    sinEnd = math.sin(segment["endAngle"])
+
+                    startX = round(cosStart * radius + locationX, 3)
+                    startY = round(sinStart * radius + locationY, 3)
+                    startControlX = round(-sinStart * controlDistance, 3)
+                    startControlY = round(cosStart * controlDistance, 3)
+
+                    endX = round(cosEnd * radius + locationX, 3)
+                    endY = round(sinEnd * radius + locationY, 3)
+                    endControlX = round(sinEnd * controlDistance, 3)
+                    endControlY = round(-cosEnd * controlDistance, 3)
 
                     if reversed:
                         startControlX *= -1
@@ -1094,37 +1262,22 @@ class ExportToPovRay:
                     endControlX += endX
                     endControlY += endY
 
-                    povSpline += "<" + str(startX) + ", " + str(startY) + ">, "
-                    povSpline += "<" + str(startControlX) + ", " + str(startControlY) + ">, "
-                    povSpline += "<" + str(endControlX) + ", " + str(endControlY) + ">, "
-                    povSpline += "<" + str(endX) + ", " + str(endY) + ">//arc\n"
+                    povSpline += (
+                        f"<{startX}, {startY}>, "
+                        f"<{startControlX}, {startControlY}>, "
+                        f"<{endControlX}, {endControlY}>, "
+                        f"<{endX}, {endY}>//arc\n"
+                    )
 
                     numOfPoints += 4
 
         return [povSpline, numOfPoints]
 
-    def getNextLine(self, lines, lastLine):
-        """Get index of next line for the given last line."""
-
-        # returns index
-        i = 0
-        for line in lines:
-            if self.isSamePoint(line.EndPoint, lastLine.EndPoint) or self.isSamePoint(line.StartPoint, lastLine.EndPoint):
-                return i
-            i += 1
-        return -1
-
-    def isSamePoint(self, point1, point2):
-        """Check if two points are equal."""
+    def getPointKey(self, point):
+        """Return the rounded coordinates of the given point, equal points have equal keys."""
 
         # round because FreeCAD has rounding mistakes
-        if (
-            round(point1.x, 3) == round(point2.x, 3)
-            and round(point1.y, 3) == round(point2.y, 3)
-            and round(point1.z, 3) == round(point2.z, 3)
-        ):
-            return True
-        return False
+        return (round(point.x, 3), round(point.y, 3), round(point.z, 3))
 
     def hasLinesConstructive(self, lines):
         """Has the given lines array constructive lines in it."""
@@ -1137,48 +1290,28 @@ class ExportToPovRay:
     def isBodySupported(self, body):
         """Is the given body fully supported."""
 
-        supportedTypeIds = [
-            "App::Origin",
-            "App::Line",
-            "App::Plane",
-            "Sketcher::SketchObject",
-            "PartDesign::Pad",
-            "PartDesign::Pocket",
-            "PartDesign::Point",
-            "PartDesign::Line",
-            "PartDesign::Plane"
-        ]
+        supportedTypeIds = self.bodySupportedTypeIds
 
-        children = body.OutListRecursive
+        supportedTypes = ["Length"]
 
-        # are objects supported
-        for obj in children:
-            if not obj.TypeId in supportedTypeIds:
+        # test the objects and the types of pads and pockets, collect sketches
+        sketches = []
+        for obj in body.OutListRecursive:
+            typeId = obj.TypeId
+            if not typeId in supportedTypeIds:
                 return False
 
-        # get sketches
-        sketches = []
-        for obj in children:
-            if obj.TypeId == "Sketcher::SketchObject":
+            if typeId == "Sketcher::SketchObject":
                 sketches.append(obj)
+            elif typeId == "PartDesign::Pad" or typeId == "PartDesign::Pocket":
+                if not obj.Type in supportedTypes:
+                    return False
 
         # test sketches
         for sketch in sketches:
             if not self.isSketchSupported(sketch):
                 return False
 
-        supportedTypes = ["Length"]
-        # get pads and pockets
-        padsPockets = []
-        for obj in children:
-            if obj.TypeId == "PartDesign::Pad" or obj.TypeId == "PartDesign::Pocket":
-                padsPockets.append(obj)
-
-        # test types
-        for obj in padsPockets:
-            if not obj.Type in supportedTypes:
-                return False
-
         return True
 
     def isPadPocketSupported(self, fcObj):
@@ -1236,145 +1369,145 @@ class ExportToPovRay:
 
         return True
 
-    def createMesh(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef):
+    def createMesh(self, fcObj, expPlacement, expPigment, expPhotons, expClose, expMeshDef, depth=0):
         """Create a pov mesh from the given FreeCAD object. Arguments are the same as for createPovCode()."""
 
-        povCode = ""
+        povCode = []
+        meshName = stringCorrection(fcObj.Label) + "_mesh"
 
         if expMeshDef:
             mesh = 0
+            meshKey = fcObj.Name  # key of the mesh in self.meshCache
+            shape = None
 
             if fcObj.isDerivedFrom("Mesh::Feature"):  # is fcObj a mesh
                 mesh = fcObj.Mesh
             else:
                 try:
-                    shape = fcObj.Shape.copy()
                     try:
                         angularDeflection = fcObj.ViewObject.AngularDeflection.getValueAs("rad").Value
                     except:
                         angularDeflection = 0.5
                     deviation = fcObj.ViewObject.Deviation
 
+                    # equal shapes with equal tessellation settings get the same mesh
+                    shape = fcObj.Shape
+                    meshKey = (shape.hashCode(), deviation, angularDeflection)
+                except:
+                    return ""
+
+            # equal hash codes don't guarantee equal shapes
+            cachedMesh = self.meshCache.get(meshKey)
+            if cachedMesh is not None and shape is not None and not shape.isEqual(cachedMesh[0]):
+                cachedMesh = None
+
+            if cachedMesh is None and shape is not None:
+                try:
+                    shapeCopy = shape.copy()
                     try:
                         mesh = MeshPart.meshFromShape(
-                            Shape=shape,
+                            Shape=shapeCopy,
                             LinearDeflection=deviation,
                             AngularDeflection=angularDeflection,
                             Relative=False,
                         )
                     except:
                         mesh = MeshPart.meshFromShape(
-                            shape, deviation, angularDeflection
+                            shapeCopy, deviation, angularDeflection
                         )
 
                 except:
                     return ""
 
+            points = triangles = None
+            if cachedMesh is None and mesh:
+                points, triangles = mesh.Topology
 
-            if not mesh or len(mesh.Topology[0]) == 0 or len(mesh.Topology[1]) == 0:
+            if cachedMesh is not None:  # the mesh is already declared
+                meshName = cachedMesh[1]
+
+            elif not points or not triangles:
                 #warningMessage = "\n\nNo mesh created - Object " + fcObj.Label + " won't be rendered"
                 #App.Console.PrintWarning(warningMessage)
                 return ""
 
-            # create mesh2 object
-            povMesh = "#declare " + stringCorrection(fcObj.Label) + "_mesh ="
-            povMesh += "\nmesh2 {\n\tvertex_vectors {\n"
-
-            # create vertex_vectors
-            numOfVertex = len(mesh.Topology[0])
-            povMesh += "\t\t" + str(numOfVertex)
+            else:
+                # write mesh in inc file, it is created with the first mesh
+                if self.meshFile is None:
+                    self.meshFile = open(
+                        self.meshPath, "w", buffering=self.writeBufferSize, newline=self.newline
+                    )
+                meshFile = self.meshFile
 
-            for point in mesh.Topology[0]:
-                povMesh += (
-                    ",\n\t\t<"
-                    + str(point.x) + ", "
-                    + str(point.y) + ", "
-                    + str(point.z) + ">"
+                # create mesh2 object
+                meshFile.write(
+                    "#declare " + meshName + " =\nmesh2 {\n\tvertex_vectors {\n"
+                    + "\t\t" + str(len(points))
                 )
-            povMesh += "\n\t}\n\n"
-
-            # create face_indices
-            povMesh += "\tface_indices {\n"
-            numOfTriangles = len(mesh.Topology[1])
-            povMesh += "\t\t" + str(numOfTriangles)
-
-            for triangle in mesh.Topology[1]:
-                povMesh += (
-                    ",\n\t\t<"
-                    + str(triangle[0]) + ", "
-                    + str(triangle[1]) + ", "
-                    + str(triangle[2]) + ">"
+
+                # create vertex_vectors
+                meshFile.writelines(
+                    f",\n\t\t<{point.x}, {point.y}, {point.z}>" for point in points
                 )
-            povMesh += "\n\t}\n\n"
+                meshFile.write("\n\t}\n\n")
 
-            # add inside vector
-            povMesh += "\tinside_vector <1, 1, 1>\n"
+                # create face_indices
+                meshFile.write("\tface_indices {\n\t\t" + str(len(triangles)))
+                meshFile.writelines(
+                    f",\n\t\t<{triangle[0]}, {triangle[1]}, {triangle[2]}>" for triangle in triangles
+                )
+                meshFile.write("\n\t}\n\n")
 
-            povMesh += "}\n\n"
+                # add inside vector
+                meshFile.write("\tinside_vector <1, 1, 1>\n}\n\n")
 
-            # write mesh in inc file
-            self.meshFileContent += povMesh
+                self.meshCache[meshKey] = (shape, meshName)
 
         # return pov code
-        povCode += "\nobject { " + stringCorrection(fcObj.Label) + "_mesh\n"
+        povCode.append("\nobject { " + meshName + "\n")
         pigment = self.getMaterial(fcObj)
 
-        if expPlacement == False: #meshes are already translated, so if they shouldn't translated, they translated back
+        if not expPlacement: #meshes are already translated, so if they shouldn't translated, they translated back
             translation = self.getTranslation(fcObj)
             if translation != "":  # test if the object is translated
-                povCode += "\t" + translation + " * (-1)\n"
+                povCode.append("\t" + translation + " * (-1)\n")
 
             rotation = self.getInvertedRotation(fcObj)
             if rotation != "":  # test if the object is rotated
-                povCode += rotation.replace("\n", "\t\n")
+                povCode.append(rotation.replace("\n", "\t\n"))
 
         if pigment != "":  # test if the object has the standard pigment
-            povCode += "\t" + pigment + "\n"
+            povCode.append("\t" + pigment + "\n")
 
         if expPhotons:
             photons = self.getPhotons(fcObj)
             if photons != "":
-                povCode += "\t" + photons + "\n"
+                povCode.append("\t" + photons + "\n")
 
         if expClose:
-            povCode += "}\n"
+            povCode.append("}\n")
 
-        return povCode
+        return self.indentCode("".join(povCode), depth)
 
 
-    def getStatistics(self, objs):
-        """Return the statistics of the current FreeCAD model."""
+    def scanObjects(self, objs):
+        """
+        Walk once over all objects of the model and collect everything that is needed before the export.
 
-        statistics = ""
+        self.partChildren holds the names of all objects that have a body or a std part as parent,
+        self.objCounts holds the numbers for getStatistics().
+        """
+
+        self.partChildren = set()
         noCsgCount = 0
         CsgCount = 0
         ParentCount = 0
-        supportedTypeIds = [
-            "Part::Sphere",
-            "Part::Box",
-            "Part::Torus",
-            "Part::Cylinder",
-            "Part::Cone",
-            "Part::Ellipsoid",
-            "Part::Plane",
-            "Part::Cut",
-            "Part::MultiFuse",
-            "Part::Fuse",
-            "Part::MultiCommon",
-            "Part::Common",
-            "Part::Extrusion",
-            "PartDesign::Body" "PartDesign::Pad",
-            "PartDesign::Pocket",
-            "Sketcher::SketchObject",
-            "App::DocumentObjectGroup",
-            "App:Part",
-            "Part::Compound",
-            "Image::ImagePlane"
-        ]
-        supportedNames = ["Array", "Clone", "PointLight", "AreaLight", "SpotLight"]
+        supportedTypeIds = self.supportedTypeIds
+        supportedNames = self.supportedNames
 
         for obj in objs:
-            if not obj.TypeId in supportedTypeIds and not self.isNameSupported(
+            typeId = obj.TypeId
+            if not typeId in supportedTypeIds and not self.isNameSupported(
                 obj.Name, supportedNames
             ):
                 noCsgCount = noCsgCount + 1
@@ -1383,6 +1516,24 @@ class ExportToPovRay:
             if obj.InList == []:
                 ParentCount = ParentCount + 1
 
+            # mark the children of bodies and std parts
+            if typeId == "PartDesign::Body" or typeId == "App::Part":
+                self.partChildren.update(child.Name for child in obj.OutList)
+
+        self.objCounts = {
+            "noCsgCount": noCsgCount,
+            "CsgCount": CsgCount,
+            "ParentCount": ParentCount,
+        }
+
+    def getStatistics(self):
+        """Return the statistics of the current FreeCAD model (collected by scanObjects())."""
+
+        statistics = ""
+        noCsgCount = self.objCounts["noCsgCount"]
+        CsgCount = self.objCounts["CsgCount"]
+        ParentCount = self.objCounts["ParentCount"]
+
         statistics += "Path to *.pov File: " + self.povPath + "\n"
         statistics += str(ParentCount) + " parent objects found in highest layer\n"
         statistics += "containing totally " + str(CsgCount + noCsgCount) + " objects\n"
@@ -1399,7 +1550,7 @@ class ExportToPovRay:
             camInfo = "Orthographic camera\n"
         else:
             camInfo = "Unknown camera type - rudimentary camera statement will be used\n"
-        if self.incContent.find("camera") != -1:
+        if self.hasIncCamera:
             camInfo = "User defined camera found - FreeCAD camera will be commented out in *.pov file\n"
 
         statistics += camInfo
@@ -1447,12 +1598,23 @@ class ExportToPovRay:
 
                 return povBg
         else:
-            bgColor1 = App.ParamGet("User parameter:BaseApp/Preferences/View").GetUnsigned('BackgroundColor')
-            bgColor2 = App.ParamGet("User parameter:BaseApp/Preferences/View").GetUnsigned('BackgroundColor2')
-            bgColor3 = App.ParamGet("User parameter:BaseApp/Preferences/View").GetUnsigned('BackgroundColor3')
-            bgColor4 = App.ParamGet("User parameter:BaseApp/Preferences/View").GetUnsigned('BackgroundColor4')
+            # background settings of FreeCAD
+            viewParams = self.viewParams
+            bgColor1 = viewParams.GetUnsigned('BackgroundColor')
+            bgColor2 = viewParams.GetUnsigned('BackgroundColor2')
+            bgColor3 = viewParams.GetUnsigned('BackgroundColor3')
+            bgColor4 = viewParams.GetUnsigned('BackgroundColor4')
+            isSimple = viewParams.GetBool('Simple')
+            isGradient = viewParams.GetBool('Gradient')
+            useMidColor = viewParams.GetBool('UseBackgroundColorMid')
             ViewDir = Gui.ActiveDocument.ActiveView.getViewDirection()
 
+            # background colors in pov syntax
+            rgbColor1 = self.uintColorToRGB(bgColor1)
+            rgbColor2 = self.uintColorToRGB(bgColor2)
+            rgbColor3 = self.uintColorToRGB(bgColor3)
+            rgbColor4 = self.uintColorToRGB(bgColor4)
+
             AspectRatio = self.width / float(self.height)
 
             if self.CamType == "Orthographic":
@@ -1478,37 +1640,35 @@ class ExportToPovRay:
                 )
                 povBg += ">, <" + str(-right / 2) + ", " + str(-up / 2) + ">\n"
                 povBg += "\tpigment {"
-                if App.ParamGet("User parameter:BaseApp/Preferences/View").GetBool('Simple'):
-                    povBg += " color rgb" + self.uintColorToRGB(bgColor1) + " }\n"
-                elif App.ParamGet("User parameter:BaseApp/Preferences/View").GetBool('Gradient'):
+                if isSimple:
+                    povBg += " color rgb" + rgbColor1 + " }\n"
+                elif isGradient:
                     povBg += "\n\t\tgradient y\n"
                     povBg += "\t\tcolor_map {\n"
                     povBg += (
                         "\t\t\t[ 0.00  color rgb"
-                        + self.uintColorToRGB(bgColor3)
+                        + rgbColor3
                         + " ]\n"
                     )
                     povBg += (
                         "\t\t\t[ 0.05  color rgb"
-                        + self.uintColorToRGB(bgColor3)
+                        + rgbColor3
                         + " ]\n"
                     )
-                    if App.ParamGet("User parameter:BaseApp/Preferences/View").GetBool(
-                        "UseBackgroundColorMid"
-                    ):
+                    if useMidColor:
                         povBg += (
                             "\t\t\t[ 0.50  color rgb"
-                            + self.uintColorToRGB(bgColor4)
+                            + rgbColor4
                             + " ]\n"
                         )
                     povBg += (
                         "\t\t\t[ 0.95  color rgb"
-                        + self.uintColorToRGB(bgColor2)
+                        + rgbColor2
                         + " ]\n"
                     )
                     povBg += (
                         "\t\t\t[ 1.00  color rgb"
-                        + self.uintColorToRGB(bgColor2)
+                        + rgbColor2
                         + " ]\n"
                     )
                     povBg += "\t\t}\n"
@@ -1538,18 +1698,18 @@ class ExportToPovRay:
                 povBg += "}\n"
 
             povBg += "sky_sphere {\n\tpigment {\n"
-            if App.ParamGet("User parameter:BaseApp/Preferences/View").GetBool('Simple'):
-                povBg += "\t\tcolor rgb" + self.uintColorToRGB(bgColor1) + "\n"
+            if isSimple:
+                povBg += "\t\tcolor rgb" + rgbColor1 + "\n"
 
-            elif App.ParamGet("User parameter:BaseApp/Preferences/View").GetBool('Gradient'):
+            elif isGradient:
                 povBg += "\t\tgradient z\n"
                 povBg += "\t\tcolor_map {\n"
-                povBg += "\t\t\t[ 0.00  color rgb" + self.uintColorToRGB(bgColor3) +" ]\n"
-                povBg += "\t\t\t[ 0.30  color rgb" + self.uintColorToRGB(bgColor3) +" ]\n"
-                if App.ParamGet("User parameter:BaseApp/Preferences/View").GetBool('UseBackgroundColorMid'):
-                    povBg += "\t\t\t[ 0.50  color rgb" + self.uintColorToRGB(bgColor4) +" ]\n"
-                povBg += "\t\t\t[ 0.70  color rgb" + self.uintColorToRGB(bgColor2) +" ]\n"
-                povBg += "\t\t\t[ 1.00  color rgb" + self.uintColorToRGB(bgColor2) +" ]\n"
+                povBg += "\t\t\t[ 0.00  color rgb" + rgbColor3 +" ]\n"
+                povBg += "\t\t\t[ 0.30  color rgb" + rgbColor3 +" ]\n"
+                if useMidColor:
+                    povBg += "\t\t\t[ 0.50  color rgb" + rgbColor4 +" ]\n"
+                povBg += "\t\t\t[ 0.70  color rgb" + rgbColor2 +" ]\n"
+                povBg += "\t\t\t[ 1.00  color rgb" + rgbColor2 +" ]\n"
                 povBg += "\t\t}\n"
                 povBg += "\t\tscale 2\n"
                 povBg += "\t\ttranslate -1\n"
@@ -1568,9 +1728,6 @@ class ExportToPovRay:
 
         AspectRatio = self.width / float(self.height)
 
-        PovCam = ""
-        incCamera = False
-
         PovCamType = ""
         PovCamAngle = ""
         PovCamUp = ""
@@ -1578,13 +1735,13 @@ class ExportToPovRay:
 
         if self.CamType == "Perspective":
             PovCamUp = "<0, 0, 1>"
-            PovCamRight = "<" + "{0:1.2f}".format(AspectRatio) + ", 0, 0>"
+            PovCamRight = f"<{AspectRatio:1.2f}, 0, 0>"
 
             if AspectRatio <= 1:
                 CamAngle = 45
             else:
                 CamAngle = math.degrees(math.atan2(AspectRatio / 2, 1.2071067812)) * 2
-            PovCamAngle = "\tangle {0:1.2f}".format(CamAngle) + "\n"
+            PovCamAngle = f"\tangle {CamAngle:1.2f}\n"
 
         elif self.CamType == "Orthographic":
             if AspectRatio >= 1:
@@ -1594,60 +1751,92 @@ class ExportToPovRay:
                 right = self.CamNode.height.getValue()
                 up = right / AspectRatio
             PovCamType = "\torthographic\n"
-            PovCamUp = "< 0, 0, " + "{0:1.2f}".format(up) + ">"
-            PovCamRight = "<" + "{0:1.2f}".format(right) + ", 0, 0>"
-
-        PovCam += "#declare CamUp = " + PovCamUp + ";\n"
-        PovCam += "#declare CamRight = " + PovCamRight + ";\n"
-        PovCam += (
-            "#declare CamRotation = <"
-            + str(self.EulerCam[2] - 90) + ", "
-            + str(self.EulerCam[1]) + ", "
-            + str(self.EulerCam[0]) + ">;\n"
-        )
-        PovCam += (
-            "#declare CamPosition = <"
-            + str(self.CamPos.Base.x) + ", "
-            + str(self.CamPos.Base.y) + ", "
-            + str(self.CamPos.Base.z) + ">;\n"
+            PovCamUp = f"< 0, 0, {up:1.2f}>"
+            PovCamRight = f"<{right:1.2f}, 0, 0>"
+
+        # a camera in the user inc file replaces the FreeCAD camera, which is commented out then
+        if self.hasIncCamera:
+            commentStart, commentEnd = "/*", "*/\n"
+        else:
+            commentStart, commentEnd = "", ""
+
+        camBase = self.CamPos.Base
+        EulerCam = self.EulerCam
+
+        return (
+            f"#declare CamUp = {PovCamUp};\n"
+            f"#declare CamRight = {PovCamRight};\n"
+            f"#declare CamRotation = <{EulerCam[2] - 90}, {EulerCam[1]}, {EulerCam[0]}>;\n"
+            f"#declare CamPosition = <{camBase.x}, {camBase.y}, {camBase.z}>;\n"
+            f"{commentStart}camera {{\n"
+            f"{PovCamType}"
+            "\tlocation <0, 0, 0>\n"
+            "\tdirection <0, 1, 0>\n"
+            "\tup CamUp\n"
+            "\tright CamRight\n"
+            "\trotate CamRotation\n"
+            "\ttranslate CamPosition\n"
+            f"{PovCamAngle}"
+            f"}}\n{commentEnd}"
         )
 
-        if self.incContent.find("camera") != -1:
-            incCamera = True
-            PovCam += "/*"
 
-        PovCam += "camera {\n"
-        PovCam += PovCamType
-        PovCam += "\tlocation <0, 0, 0>\n"
-        PovCam += "\tdirection <0, 1, 0>\n"
-        PovCam += "\tup CamUp\n"
-        PovCam += "\tright CamRight\n"
-        PovCam += "\trotate CamRotation\n"
-        PovCam += "\ttranslate CamPosition\n"
-        PovCam += PovCamAngle
-        PovCam += "}\n"
-        if incCamera:
-            PovCam += "*/\n"
+    def clearCaches(self):
+        """Clear the per export caches of getMaterial(), getRotation(), getEulerAngles(), getTranslation(), getPhotons(), createMesh() and declareArrayBase()."""
+
+        # keys are the names of the FreeCAD objects
+        self.materialCache = {}
+        self.rotationCache = {}
+        self.eulerCache = {}
+        self.translationCache = {}
+        self.photonsCache = {}
 
-        return PovCam
+        # shapes and names of the declared meshes, keys are the name of a mesh object or
+        # the hash code of a shape together with the tessellation settings
+        self.meshCache = {}
 
+        # names of the declared array base objects, keys are the names of the objects
+        # together with the pigment, photons and mesh options of the declaration
+        self.declaredNames = {}
+        # numbers of the declarations of every object
+        self.declareCounts = {}
 
     def getTranslation(self, fcObj):
         """Return the translation of the given FreeCAD object in pov code."""
 
+        if fcObj.Name in self.translationCache:
+            return self.translationCache[fcObj.Name]
+
         translation = ""
-        x = fcObj.Placement.Base.x  # get the position in every axis
-        y = fcObj.Placement.Base.y
-        z = fcObj.Placement.Base.z
-        if x != 0 or y != 0 or z != 0: #test whether the position is 0,0,0
-            translation += "translate <" + str(x) + ", " + str(y) + ", " + str(z) + ">" #create translation vector
+        base = fcObj.Placement.Base  # get the position
+        x, y, z = base.x, base.y, base.z
+        if x or y or z: #test whether the position is 0,0,0
+            translation = f"translate <{x}, {y}, {z}>" #create translation vector
 
+        self.translationCache[fcObj.Name] = translation
         return translation
 
     def getRotation(self, fcObj):
         """Return the rotation of the given FreeCAD object in pov code."""
 
+        if fcObj.Name in self.rotationCache:
+            return self.rotationCache[fcObj.Name]
+
         rotate = ""
+        x, y, z = self.getEulerAngles(fcObj)
+
+        if x or y or z:
+            rotate = f"rotate <{x}, {y}, {z}>"  # create rotation vector
+
+        self.rotationCache[fcObj.Name] = rotate
+        return rotate
+
+    def getEulerAngles(self, fcObj):
+        """Return the rotation of the given FreeCAD object as euler angles (x, y, z) in pov orientation."""
+
+        if fcObj.Name in self.eulerCache:
+            return self.eulerCache[fcObj.Name]
+
         eulerRot = fcObj.Placement.Rotation.toEuler()  # convert the rotation to euler angles
         x = eulerRot[2]  # get rotation in every axis
         y = eulerRot[1]
@@ -1659,136 +1848,93 @@ class ExportToPovRay:
         elif fcObj.TypeId == "Sketcher::SketchObject":
             x -= 90
 
-        if x != 0 or y != 0 or z != 0:
-            rotate = (
-                "rotate <" + str(x) + ", " + str(y) + ", " + str(z) + ">"
-            )  # create rotation vector
-
-        return rotate
+        self.eulerCache[fcObj.Name] = (x, y, z)
+        return (x, y, z)
 
     def getInvertedRotation(self, fcObj):
         """Return the inverted rotation of the given FreeCAD object in pov code."""
-        rotate = ""
-        eulerRot = fcObj.Placement.Rotation.toEuler()  # convert the rotation to euler angles
-        x = eulerRot[2]  # get rotation in every axis
-        y = eulerRot[1]
-        z = eulerRot[0]
 
-        # if fcObj is a torus it is necessary to rotate it in x axis
-        if fcObj.TypeId == "Part::Torus" or (
-            fcObj.Name.startswith("Clone") and fcObj.OutList[0].TypeId == "Part::Torus"
-        ):
-            x += 90
-        elif fcObj.TypeId == "Sketcher::SketchObject":
-            x -= 90
+        x, y, z = self.getEulerAngles(fcObj)
 
-        rotate = "\n"
+        rotate = ["\n"]
 
         if z != 0:
-            rotate += "rotate <0, 0, " + str(-z) + ">\n"
+            rotate.append(f"rotate <0, 0, {-z}>\n")
         if y != 0:
-            rotate += "rotate <0, " + str(-y) + ", 0>\n"
+            rotate.append(f"rotate <0, {-y}, 0>\n")
         if x != 0:
-            rotate += "rotate <" + str(-x) + ", 0, 0>\n"
+            rotate.append(f"rotate <{-x}, 0, 0>\n")
 
-        return rotate
+        return "".join(rotate)
 
     def getPhotons(self, fcObj):
         """Return the photons block of the given FreeCAD object in pov code."""
 
-        photons = "\nphotons {"
+        if fcObj.Name in self.photonsCache:
+            return self.photonsCache[fcObj.Name]
 
-        if (
-            self.incContent.find(
-                "#declare " + stringCorrection(fcObj.Label) + "_photons"
-            )
-            == -1
-        ):
+        label = stringCorrection(fcObj.Label)
+        incDeclarations = self.incDeclarations
+
+        if not self.isDeclared(incDeclarations, label + "_photons"):
+            self.photonsCache[fcObj.Name] = ""
             return ""
         else:
+            photons = ["\nphotons {"]
+
             if fcObj.Name.find("Light") == -1:  # light objects shouldn't get a target
-                photons += "\n\ttarget"
+                photons.append("\n\ttarget")
 
-            if (
-                self.incContent.find(
-                    "#declare " + stringCorrection(fcObj.Label) + "_photons_reflection"
-                )
-                != -1
-            ):
-                photons += (
-                    "\n\treflection "
-                    + stringCorrection(fcObj.Label)
-                    + "_photons_reflection"
-                )
+            if self.isDeclared(incDeclarations, label + "_photons_reflection"):
+                photons.append("\n\treflection " + label + "_photons_reflection")
 
-            if (
-                self.incContent.find(
-                    "#declare " + stringCorrection(fcObj.Label) + "_photons_refraction"
-                )
-                != -1
-            ):
-                photons += (
-                    "\n\trefraction "
-                    + stringCorrection(fcObj.Label)
-                    + "_photons_refraction"
-                )
+            if self.isDeclared(incDeclarations, label + "_photons_refraction"):
+                photons.append("\n\trefraction " + label + "_photons_refraction")
 
-            if (
-                self.incContent.find(
-                    "#declare " + stringCorrection(fcObj.Label) + "_photons_collect"
-                )
-                != -1
-            ):
-                photons += (
-                    "\n\tcollect " + stringCorrection(fcObj.Label) + "_photons_collect"
-                )
+            if self.isDeclared(incDeclarations, label + "_photons_collect"):
+                photons.append("\n\tcollect " + label + "_photons_collect")
 
-        photons += "\n}\n"
+        photons.append("\n}\n")
+        photons = "".join(photons)
 
+        self.photonsCache[fcObj.Name] = photons
         return photons
 
 
     def getMaterial(self, fcObj):
         """Return the pigment/material of the given FreeCAD object in pov code."""
 
-        viewObject = self.getViewObject(fcObj)
+        if fcObj.Name in self.materialCache:
+            return self.materialCache[fcObj.Name]
 
-        material = ""
-        material += self.getPigment(viewObject)
-        material += self.getFinish(viewObject)
+        label = stringCorrection(fcObj.Label)
+        texIncDeclarations = self.texIncDeclarations
+        material = None  # no declared material
 
         # material declarations tex.inc
-        if (
-            self.texIncContent.find(
-                "#declare " + stringCorrection(fcObj.Label) + "_material_hollow"
-            )
-            != -1
-        ):
-            material = (
-                "\nhollow\nmaterial {"
-                + stringCorrection(fcObj.Label)
-                + "_material_hollow }\n"
-            )
-
-        elif self.texIncContent.find("#declare " + stringCorrection(fcObj.Label) + "_") != -1:
-            if self.texIncContent.find("#declare " + stringCorrection(fcObj.Label) + "_material") != -1:
-                material = "\nmaterial {" + stringCorrection(fcObj.Label) + "_material }\n"
-            elif self.texIncContent.find("#declare " + stringCorrection(fcObj.Label) + "_texture") != -1:
-                material = "\ntexture {" + stringCorrection(fcObj.Label) + "_texture }\n"
-            elif self.texIncContent.find("#declare " + stringCorrection(fcObj.Label) + "_pigment") != -1:
-                material = "\npigment {" + stringCorrection(fcObj.Label) + "_pigment }\n"
+        if self.isDeclared(texIncDeclarations, label + "_"):
+            if self.isDeclared(texIncDeclarations, label + "_material_hollow"):
+                material = "\nhollow\nmaterial {" + label + "_material_hollow }\n"
+            elif self.isDeclared(texIncDeclarations, label + "_material"):
+                material = "\nmaterial {" + label + "_material }\n"
+            elif self.isDeclared(texIncDeclarations, label + "_texture"):
+                material = "\ntexture {" + label + "_texture }\n"
+            elif self.isDeclared(texIncDeclarations, label + "_pigment"):
+                material = "\npigment {" + label + "_pigment }\n"
             else:
+                self.materialCache[fcObj.Name] = ""
                 return ""
 
         # material declarations in _user.inc
-        if (
-            self.incContent.find(
-                "#declare " + stringCorrection(fcObj.Label) + "_material"
-            )
-            != -1
-        ):
-            material = "\nmaterial {" + stringCorrection(fcObj.Label) + "_material }\n"
+        if self.isDeclared(self.incDeclarations, label + "_material"):
+            material = "\nmaterial {" + label + "_material }\n"
+
+        # FreeCAD material if nothing is declared
+        elif material is None:
+            viewObject = self.getViewObject(fcObj)
+            material = self.getPigment(viewObject) + self.getFinish(viewObject)
 
+        self.materialCache[fcObj.Name] = material
         return material
 
     def getPigment(self, viewObject):
@@ -1796,11 +1942,9 @@ class ExportToPovRay:
         shapeColorRGB = self.getShapeColorRGB(viewObject)
 
         if viewObject.Transparency != 0:
-            transparency += self.getTransparency(viewObject)
+            transparency = self.getTransparency(viewObject)
 
-        if transparency != "" or shapeColorRGB != self.uintColorToRGB(
-            self.DefaultShapeColor
-        ):
+        if transparency != "" or shapeColorRGB != self.DefaultShapeColorRGB:
             return "\tpigment { color rgb " + shapeColorRGB + transparency + " }\n"
 
         return ""
@@ -1811,107 +1955,74 @@ class ExportToPovRay:
         emission = ""
         phong = ""
 
+        shapeMaterial = viewObject.ShapeMaterial
+        ambientColor = shapeMaterial.AmbientColor
+        emissiveColor = shapeMaterial.EmissiveColor
+        specularColor = shapeMaterial.SpecularColor
+
         # ambient color
-        if viewObject.ShapeMaterial.AmbientColor != (
-            0.20000000298023224,
-            0.20000000298023224,
-            0.20000000298023224,
-            0,
-        ):
-            ambient += self.getAmbient(viewObject)
+        if ambientColor != defaultAmbientColor:
+            ambient = self.getAmbient(ambientColor)
 
         # emissive color
-        if viewObject.ShapeMaterial.EmissiveColor != (0, 0, 0, 0):
-            emission += self.getEmission(viewObject)
+        if emissiveColor != noColor:
+            emission = self.getEmission(emissiveColor)
 
         # specular color / phong
-        if viewObject.ShapeMaterial.SpecularColor != (0, 0, 0, 0):
-            phong += self.getPhong(viewObject)
+        if specularColor != noColor:
+            phong = self.getPhong(specularColor, shapeMaterial.Shininess)
 
         # finish
         if ambient != "" or emission != "" or phong != "":
-            finish = "finish {"
-            finish += "\n\t" + ambient
-            finish += "\n\t" + emission
-            finish += "\n\t" + phong
-            finish += "\n}\n"
+            finish = f"finish {{\n\t{ambient}\n\t{emission}\n\t{phong}\n}}\n"
 
         return finish
 
     @staticmethod
     def getShapeColorRGB(viewObject):
-        return "<{0:1.3f}, {1:1.3f}, {2:1.3f}>".format(
-            viewObject.ShapeColor[0], viewObject.ShapeColor[1], viewObject.ShapeColor[2]
-        )
+        shapeColor = viewObject.ShapeColor
+        return f"<{shapeColor[0]:1.3f}, {shapeColor[1]:1.3f}, {shapeColor[2]:1.3f}>"
 
     @staticmethod
     def getTransparency(viewObject):
         return " transmit " + str(viewObject.Transparency / float(100))
 
     @staticmethod
-    def getAmbient(viewObject):
-        ambient = ""
-        ambient += "ambient rgb<"
-        ambient += "{0:1.3f}, {1:1.3f}, {2:1.3f}".format(
-            viewObject.ShapeMaterial.AmbientColor[0],
-            viewObject.ShapeMaterial.AmbientColor[1],
-            viewObject.ShapeMaterial.AmbientColor[2],
-        )
-        ambient += ">"
-
-        return ambient
+    def getAmbient(ambientColor):
+        return f"ambient rgb<{ambientColor[0]:1.3f}, {ambientColor[1]:1.3f}, {ambientColor[2]:1.3f}>"
 
     @staticmethod
-    def getEmission(viewObject):
-        emission = ""
-        emission += "emission rgb<"
-        emission += "{0:1.3f}, {1:1.3f}, {2:1.3f}".format(
-            viewObject.ShapeMaterial.EmissiveColor[0],
-            viewObject.ShapeMaterial.EmissiveColor[1],
-            viewObject.ShapeMaterial.EmissiveColor[2],
-        )
-        emission += ">"
-
-        return emission
+    def getEmission(emissiveColor):
+        return f"emission rgb<{emissiveColor[0]:1.3f}, {emissiveColor[1]:1.3f}, {emissiveColor[2]:1.3f}>"
 
     @staticmethod
-    def getPhong(viewObject):
-        phong = ""
-        phong += "phong "
-        phong += "{0:1.2f}".format(
-            (
-                viewObject.ShapeMaterial.SpecularColor[0]
-                + viewObject.ShapeMaterial.SpecularColor[1]
-                + viewObject.ShapeMaterial.SpecularColor[2]
-            )
-            / 3
-        )
-        phong += " phong_size "
-        phong += str(viewObject.ShapeMaterial.Shininess * 50)
-        phong += " "
-
-        return phong
+    def getPhong(specularColor, shininess):
+        phong = (specularColor[0] + specularColor[1] + specularColor[2]) / 3
+        return f"phong {phong:1.2f} phong_size {shininess * 50} "
 
 
-    def writeFile(self, povText):
+    def writeFile(self, povCode):
         """Write the final pov file."""
 
-        # povText: the code for POV-Ray
+        # povCode: iterable of the strings with the code for POV-Ray
         try:
-            file = open(self.povPath, "w+")  # XXX open file (Really "w+"?)
-            file.write(povText)  # write code
-            file.close()  # close file
-        except:
+            with open(
+                self.povPath, "w", buffering=self.writeBufferSize, newline=self.newline
+            ) as file:
+                file.writelines(povCode)  # write code
+        except OSError as error:
+            App.Console.PrintError("Can't write the pov file: " + str(error) + "\n")
             return -1
 
     def openPovRay(self):
         """Start POV-Ray."""
 
-        povExec = App.ParamGet(preferences.prefPath).GetString("PovRayExe", "")
-        execMode = App.ParamGet(preferences.prefPath).GetInt("ExecMode", 0)
-        povOptions = App.ParamGet(preferences.prefPath).GetString("RenderParameters", "")
+        prefParams = App.ParamGet(preferences.prefPath)
+        povExec = prefParams.GetString("PovRayExe", "")
+        execMode = prefParams.GetInt("ExecMode", 0)
+        povOptions = prefParams.GetString("RenderParameters", "")
 
-        if os.path.isfile(povExec) == False:
+        if not os.path.isfile(povExec):
             errorText = "To start the rendering you must\n"
             errorText += "set the path to the POV-Ray executable\n"
             errorText += "in the settings of the workbench\n"
@@ -1922,9 +2033,8 @@ class ExportToPovRay:
         os.chdir(str(self.directory))
 
         # write user options to ini file
-        iniHandler = open(self.iniPath, "a")
-        iniHandler.write("\n;User Options from FreeCAD Settings\n" + povOptions)
-        iniHandler.close()
+        with open(self.iniPath, "a") as iniHandler:
+            iniHandler.write("\n;User Options from FreeCAD Settings\n" + povOptions)
 
         # start povray
         if execMode == 0:  # wait until finished
@@ -1937,12 +2047,10 @@ class ExportToPovRay:
         """Check error file for errors and show info box."""
 
         error = ""
-        # open error file
-        if os.path.isfile(self.errorPath) == True:
-            file = open(self.errorPath, "r")
-            # read error file
-            error = file.read()
-            file.close()
+        # read error file
+        errorFile = Path(self.errorPath)
+        if errorFile.is_file():
+            error = errorFile.read_text()
         # is there any content in the file
         if error != "":  # error occurred
             # show error message
@@ -1968,16 +2076,18 @@ class ExportToPovRay:
         for obj in objs:
             if hasattr(obj, "Placement"):
                 ObjLocation = obj.Placement
-                posX = ObjLocation.Base.x
-                posY = ObjLocation.Base.y
-                posZ = ObjLocation.Base.z
-                rotX = ObjLocation.Rotation.Axis[0]
-                rotY = ObjLocation.Rotation.Axis[1]
-                rotZ = ObjLocation.Rotation.Axis[2]
-                rotAngle = math.degrees(ObjLocation.Rotation.Angle)
+                rotation = ObjLocation.Rotation
+                rotAngle = rotation.Angle
+
+                # unrotated placements need no repair
+                if rotAngle == 0:
+                    continue
+
+                base = ObjLocation.Base
+                axis = rotation.Axis
                 obj.Placement = App.Placement(
-                    App.Vector(posX, posY, posZ),
-                    App.Rotation(App.Vector(rotX, rotY, rotZ), rotAngle),
+                    App.Vector(base.x, base.y, base.z),
+                    App.Rotation(App.Vector(axis[0], axis[1], axis[2]), math.degrees(rotAngle)),
                     App.Vector(0, 0, 0),
                 )
 
@@ -1991,71 +2101,55 @@ class ExportToPovRay:
         except:
             App.Console.PrintError("\nExport of FreeCAD view failed!\n")
 
-    def hasPartAsParent(self, fcObj):
-        """Check if the given FreeCAD object has a std part as parent object."""
-
-        for parent in fcObj.InList:
-            if parent.TypeId == "App::Part":
-                return True
-
-        return False
-
-    def hasBodyAsParent(self, fcObj):
-        """Check if the given FreeCAD object has a body as parent object."""
-
-        for parent in fcObj.InList:
-            if parent.TypeId == "PartDesign::Body":
-                return True
-
-        return False
-
-    def uintColorToRGB(self, uintColor):
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def uintColorToRGB(uintColor):
         """Convert uint color to a rgb color."""
 
-        Blue = (uintColor >> 8) & 255
-        Green = (uintColor >> 16) & 255
-        Red = (uintColor >> 24) & 255
-        rgbString = "<{0:1.3f}, {1:1.3f}, {2:1.3f}>".format(
-            Red / float(255), Green / float(255), Blue / float(255)
+        # uint colors are RGBA, the alpha byte is ignored
+        return (
+            f"<{(uintColor >> 24 & 255) * inverse255:1.3f}, "
+            f"{(uintColor >> 16 & 255) * inverse255:1.3f}, "
+            f"{(uintColor >> 8 & 255) * inverse255:1.3f}>"
         )
-        return rgbString
 
     def delComments(self, code):
         """Delete the comments in the given code (pov syntax)."""
 
-        # delete big comments
-        while code.find("/*") != -1:
-            comStart = code.find("/*")
-            comEnd = code.find("*/", comStart + 2)
-
-            if comEnd == -1:
-                App.Console.PrintError(
-                    "Unable to delete all comments in the inc file!\nThere is an unclosed multi line comment.\n"
-                )
-                return
-            code = code[0:comStart] + code[comEnd + 2 :]
+        # delete big and little comments
+        code = commentPattern.sub("", code)
 
-        # delete little comments
-        while code.find("//") != -1:
-            comStart = code.find("//")
-            comEnd = code.find("\n", comStart + 2)
+        if code.find("/*") != -1:
+            App.Console.PrintError(
+                "Unable to delete all comments in the inc file!\nThere is an unclosed multi line comment.\n"
+            )
+            return
 
-            if comEnd == -1:
-                App.Console.PrintError(
-                    "Unable to delete all comments in the inc file!\nThere is a mistake in a one line comment"
-                )
-                return
-            code = code[0:comStart] + code[comEnd:]
+        if code.find("//") != -1:
+            App.Console.PrintError(
+                "Unable to delete all comments in the inc file!\nThere is a mistake in a one line comment"
+            )
+            return
         return code
 
-    def isNameSupported(self, objName, supportedNames):
-        """Is fcObj.Name part of the supported names."""
+    @staticmethod
+    def getDeclarations(code):
+        """Return the sorted names that are declared in the given pov code (see isDeclared())."""
 
-        for name in supportedNames:
-            if objName.startswith(name):
-                return True
+        return sorted(declarationPattern.findall(code))
 
-        return False
+    @staticmethod
+    def isDeclared(declarations, namePrefix):
+        """Is a name beginning with namePrefix in the sorted declarations from getDeclarations()."""
+
+        # the names beginning with namePrefix follow directly on the insertion point of namePrefix
+        i = bisect.bisect_left(declarations, namePrefix)
+        return i < len(declarations) and declarations[i].startswith(namePrefix)
+
+    def isNameSupported(self, objName, supportedNames):
+        """Is fcObj.Name part of the supported names (a tuple of name beginnings)."""
+
+        return objName.startswith(supportedNames)
 
     @staticmethod
     def getViewObject(fcObj):
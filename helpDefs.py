@@ -59,6 +59,9 @@ def stringCorrection(inputString):  # String correction for compatibility with P
     outString = uniString.encode("ASCII", "replace")      # conversion to ASCII for POV-Ray compatibility
     return outString.decode("utf-8")                      #return and redecode to unicode but with converted chars
 
+def vectorToPov(vector):  # FreeCAD vector as POV-Ray vector "<x, y, z>"
+    return f"<{vector.x}, {vector.y}, {vector.z}>"
+
 def strToBool(str):
     if str == True:
         return True